@@ -0,0 +1,222 @@
+# backend/assignments.py
+
+import bisect
+import datetime
+import json
+import os
+import threading
+import time
+import uuid
+from typing import List, Optional
+
+# upload_id 디렉터리 안의 과제 파일
+#  - assignments.json  : 압축(compaction)된 스냅샷. 기존과 같은 JSON 배열 형식
+#  - assignments.jsonl : 스냅샷 이후 추가된 과제를 한 줄씩 덧붙이는 저널
+SNAPSHOT_FILENAME = "assignments.json"
+JOURNAL_FILENAME = "assignments.jsonl"
+# 압축 중인 저널 (이름을 바꿔 두면 그동안의 추가분은 새 저널로 간다)
+COMPACTING_FILENAME = "assignments.jsonl.compacting"
+
+
+def _read_snapshot(path: str) -> list:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return []
+    return data if isinstance(data, list) else []
+
+
+def _read_journal(path: str) -> list:
+    records = []
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # 쓰다 만 마지막 줄(서버가 죽은 경우 등)은 무시
+                    continue
+    except FileNotFoundError:
+        pass
+    return records
+
+
+def read_assignments(upload_dir: str) -> list:
+    """
+    upload_id 디렉터리의 과제 목록을 등록 순서대로 돌려줍니다 (스냅샷 + 저널).
+    압축 도중 서버가 죽어 같은 과제가 스냅샷과 저널에 모두 남았더라도 id로 한 번만 센다.
+    """
+    records = []
+    seen = set()
+    upload_id = os.path.basename(os.path.normpath(upload_dir))
+    for i, record in enumerate(_read_snapshot(os.path.join(upload_dir, SNAPSHOT_FILENAME))):
+        # 저널 도입 전에 저장된 과제에는 id가 없으므로 위치로 만든다 (스냅샷은 뒤에만 덧붙으므로 위치가 바뀌지 않는다)
+        record.setdefault("id", f"{upload_id}:{i}")
+        seen.add(record["id"])
+        records.append(record)
+    for name in (COMPACTING_FILENAME, JOURNAL_FILENAME):
+        for record in _read_journal(os.path.join(upload_dir, name)):
+            if record.get("id") in seen:
+                continue
+            seen.add(record.get("id"))
+            records.append(record)
+    return records
+
+
+def _parse_deadline(deadline: str) -> Optional[str]:
+    """'YYYY-MM-DD' 형식이면 정규화된 문자열을, 아니면 None을 돌려줍니다 (색인 제외)."""
+    try:
+        return datetime.date.fromisoformat(deadline.strip()).isoformat()
+    except (AttributeError, ValueError):
+        return None
+
+
+class DeadlineIndex:
+    """
+    마감일 순으로 정렬된 메모리 색인. 전체 목록과 upload_id별 목록을 함께 유지해
+    "N일 안에 마감되는 과제"를 이분 탐색 한 번으로 찾습니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._all = []
+        self._by_upload = {}
+        self._ids = set()
+
+    def add(self, upload_id: str, record: dict) -> None:
+        deadline = _parse_deadline(record.get("deadline", ""))
+        if deadline is None:
+            return
+        # (마감일, upload_id, id) 까지는 항상 서로 달라서 마지막 dict끼리 비교될 일이 없다
+        entry = (deadline, upload_id, record["id"], record)
+        with self._lock:
+            if record["id"] in self._ids:
+                return
+            self._ids.add(record["id"])
+            bisect.insort(self._all, entry)
+            bisect.insort(self._by_upload.setdefault(upload_id, []), entry)
+
+    def due(self, start: datetime.date, end: datetime.date, upload_id: Optional[str] = None) -> List[tuple]:
+        """start 이상 end 이하 마감인 (마감일, upload_id, id, 과제) 목록."""
+        lo_key = (start.isoformat(),)
+        hi_key = ((end + datetime.timedelta(days=1)).isoformat(),)
+        with self._lock:
+            entries = self._all if upload_id is None else self._by_upload.get(upload_id, [])
+            return entries[bisect.bisect_left(entries, lo_key):bisect.bisect_left(entries, hi_key)]
+
+
+class AssignmentStore:
+    """
+    덧붙이기 전용 저널 기반 과제 저장소.
+
+    과제 등록은 저널에 한 줄을 O_APPEND 로 한 번에 써서 끝나므로, 동시에 여러 요청이 와도
+    기존처럼 파일 전체를 읽고 다시 쓰다가 과제가 사라지는 일이 없습니다.
+    저널이 compact_bytes 보다 커지면(또는 주기적으로) 스냅샷(assignments.json)에 합칩니다.
+    마감일 색인은 처음 조회할 때 디스크에서 한 번 만들고, 이후에는 등록할 때마다 갱신합니다.
+    """
+
+    def __init__(self, upload_root: str, compact_bytes: int = 64 * 1024):
+        self.upload_root = upload_root
+        self.compact_bytes = compact_bytes
+        self.index = DeadlineIndex()
+        self._index_built = False
+        self._build_lock = threading.Lock()
+        self._locks = {}
+        self._locks_lock = threading.Lock()
+
+    def _lock_for(self, upload_id: str) -> threading.Lock:
+        with self._locks_lock:
+            return self._locks.setdefault(upload_id, threading.Lock())
+
+    def _dir(self, upload_id: str) -> str:
+        return os.path.join(self.upload_root, upload_id)
+
+    def add(self, upload_id: str, subject: str, title: str, deadline: str) -> dict:
+        """과제를 저널에 덧붙이고 색인에 반영한 뒤, 저장된 과제를 돌려줍니다."""
+        record = {
+            "id": uuid.uuid4().hex,
+            "subject": subject,
+            "title": title,
+            "deadline": deadline,
+            "created_at": time.time(),
+        }
+        line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+
+        upload_dir = self._dir(upload_id)
+        os.makedirs(upload_dir, exist_ok=True)
+        with self._lock_for(upload_id):
+            # 한 번의 write 호출로 한 줄 전체를 파일 끝에 붙인다
+            fd = os.open(os.path.join(upload_dir, JOURNAL_FILENAME), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line)
+                journal_size = os.fstat(fd).st_size
+            finally:
+                os.close(fd)
+
+        # 색인이 아직 없어도 넣어 둔다 (색인을 만드는 중이라면 id로 중복이 걸러진다)
+        self.index.add(upload_id, record)
+
+        if journal_size >= self.compact_bytes:
+            self.compact(upload_id)
+        return record
+
+    def list(self, upload_id: str) -> list:
+        with self._lock_for(upload_id):
+            return read_assignments(self._dir(upload_id))
+
+    def compact(self, upload_id: str) -> None:
+        """저널을 스냅샷에 합치고 비웁니다."""
+        upload_dir = self._dir(upload_id)
+        journal_path = os.path.join(upload_dir, JOURNAL_FILENAME)
+        compacting_path = os.path.join(upload_dir, COMPACTING_FILENAME)
+        snapshot_path = os.path.join(upload_dir, SNAPSHOT_FILENAME)
+
+        with self._lock_for(upload_id):
+            if os.path.exists(journal_path) and not os.path.exists(compacting_path):
+                os.replace(journal_path, compacting_path)
+            if not os.path.exists(compacting_path):
+                return
+            records = read_assignments(upload_dir)
+            tmp_path = f"{snapshot_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(records, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, snapshot_path)
+            os.remove(compacting_path)
+
+    def compact_all(self) -> None:
+        for upload_id in os.listdir(self.upload_root):
+            if os.path.exists(os.path.join(self._dir(upload_id), JOURNAL_FILENAME)):
+                self.compact(upload_id)
+
+    def ensure_index(self) -> None:
+        """마감일 색인이 없으면 모든 upload_id의 과제를 읽어 만듭니다 (최초 1회)."""
+        if self._index_built:
+            return
+        with self._build_lock:
+            if self._index_built:
+                return
+            for upload_id in os.listdir(self.upload_root):
+                if not os.path.isdir(self._dir(upload_id)):
+                    continue
+                for record in self.list(upload_id):
+                    self.index.add(upload_id, record)
+            self._index_built = True
+
+    def due(self, days: int, upload_id: Optional[str] = None, today: Optional[datetime.date] = None) -> list:
+        """
+        오늘부터 days일 뒤까지 마감되는 과제를 마감일 순으로 돌려줍니다.
+        upload_id를 주면 해당 upload_id의 과제만, 주지 않으면 전체 upload_id에서 찾습니다.
+        """
+        self.ensure_index()
+        start = today or datetime.date.today()
+        end = start + datetime.timedelta(days=days)
+        return [
+            {
+                "upload_id": entry_upload_id,
+                "subject": record.get("subject"),
+                "title": record.get("title"),
+                "deadline": deadline,
+            }
+            for deadline, entry_upload_id, _, record in self.index.due(start, end, upload_id)
+        ]
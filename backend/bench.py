@@ -0,0 +1,324 @@
+# backend/bench.py
+#
+# 엔드포인트별 부하 벤치마크 (회귀 확인용)
+#   python bench.py                                   # 임시 디렉터리에서 uvicorn을 띄워 측정
+#   python bench.py --files 50 --pages 30 --concurrency 16 --requests 400 --out bench.json
+#   python bench.py --url http://127.0.0.1:8000       # 이미 떠 있는 서버에 측정 (데이터가 남으니 주의)
+#
+# 결과 JSON은 시나리오별 처리량(req/s)·p50/p99(ms)·오류 수와 /metrics 의 단계별 평균 시간을 담으므로,
+# 두 실행 결과를 diff 해 어느 단계가 느려졌는지 볼 수 있다. httpx 가 필요하다.
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+UPLOAD_ID = "bench"
+SUBJECT = "digital"
+WORDS = [
+    "latch", "counter", "register", "fourier", "laplace", "matrix", "eigenvalue", "mosfet", "cmos",
+    "stack", "queue", "heap", "graph", "kernel", "thread", "mutex", "cache", "index", "query",
+]
+QUERIES = ["latch", "fourier matrix", "cache", "mutex kernel", "eigenvalue"]
+
+
+# -----------------------------------
+# 합성 PDF 코퍼스
+# -----------------------------------
+def make_pdf(pages: int, rng: random.Random, lines_per_page: int = 30) -> bytes:
+    """pdfplumber·pypdfium2가 읽을 수 있는 최소 PDF (Helvetica, ASCII 본문)."""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for _ in range(pages):
+        lines = [" ".join(rng.choice(WORDS) for _ in range(8)) for _ in range(lines_per_page)]
+        stream = "BT /F1 11 Tf 14 TL 50 800 Td " + " ".join(f"({line}) '" for line in lines) + " ET"
+        stream = stream.encode("ascii")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_no = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_no
+        )
+        kids.append(b"%d 0 R" % len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(kids), pages)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for no, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (no, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+# -----------------------------------
+# 로컬 서버
+# -----------------------------------
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(workdir: str) -> tuple:
+    """workdir를 현재 디렉터리로 uvicorn을 띄운다 (./uploads 등이 모두 workdir 아래에 만들어진다)."""
+    port = _free_port()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--app-dir", BACKEND_DIR,
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=workdir,
+    )
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError("uvicorn이 시작하지 못했습니다.")
+        try:
+            if httpx.get(url + "/", timeout=1).status_code == 200:
+                return proc, url
+        except httpx.TransportError:
+            time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError("uvicorn이 30초 안에 응답하지 않았습니다.")
+
+
+# -----------------------------------
+# 측정
+# -----------------------------------
+def _percentile(samples: list, pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def drive(name: str, requests: int, concurrency: int, op) -> dict:
+    """op(i)를 requests번, 동시에 최대 concurrency개씩 실행한다. op는 성공 여부를 돌려준다."""
+    latencies = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async def runner():
+        nonlocal errors
+        for i in counter:
+            start = time.perf_counter()
+            try:
+                ok = await op(i)
+            except httpx.HTTPError:
+                ok = False
+            latencies.append((time.perf_counter() - start) * 1000)
+            errors += 0 if ok else 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(runner() for _ in range(concurrency)))
+    seconds = time.perf_counter() - start
+    result = {
+        "requests": requests,
+        "errors": errors,
+        "seconds": round(seconds, 3),
+        "throughput_rps": round(requests / seconds, 1),
+        "p50_ms": round(statistics.median(latencies), 3),
+        "p99_ms": round(_percentile(latencies, 99), 3),
+        "max_ms": round(max(latencies), 3),
+    }
+    print(name, json.dumps(result))
+    return result
+
+
+def parse_stage_means(text: str) -> dict:
+    """/metrics 에서 단계별 (평균 ms, 횟수)를 뽑는다."""
+    sums, counts = {}, {}
+    for line in text.splitlines():
+        for suffix, target in (("_sum", sums), ("_count", counts)):
+            prefix = f"lecture_stage_duration_seconds{suffix}{{stage=\""
+            if line.startswith(prefix):
+                stage, value = line[len(prefix):].split("\"} ")
+                target[stage] = float(value)
+    return {
+        stage: {"mean_ms": round(sums[stage] / counts[stage] * 1000, 3), "count": int(counts[stage])}
+        for stage in sorted(sums) if counts.get(stage)
+    }
+
+
+async def run(url: str, args) -> dict:
+    rng = random.Random(args.seed)
+    corpus = [make_pdf(args.pages, rng) for _ in range(args.files)]
+    big = make_pdf(args.pages * 20, rng)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    scenarios = {}
+
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=120) as client:
+        job_ids = []
+
+        async def upload(i):
+            week = str(i % 16 + 1)
+            r = await client.post(
+                "/upload", data={"upload_id": UPLOAD_ID, "subject": SUBJECT, "week": week},
+                files={"files": (f"lecture_{i}.pdf", corpus[i % len(corpus)], "application/pdf")},
+            )
+            if r.status_code == 200:
+                job_ids.extend(item["job_id"] for item in r.json()["results"] if "job_id" in item)
+            return r.status_code == 200
+
+        async def chunked_upload(i):
+            chunk_size = 256 * 1024
+            r = await client.post("/upload/sessions", data={
+                "upload_id": UPLOAD_ID, "subject": SUBJECT, "week": "big",
+                "filename": f"big_{i}.pdf", "size": str(len(big)), "chunk_size": str(chunk_size),
+            })
+            if r.status_code != 200:
+                return False
+            session_id = r.json()["session_id"]
+            for n in range(0, -(-len(big) // chunk_size)):
+                chunk = big[n * chunk_size:(n + 1) * chunk_size]
+                r = await client.put(f"/upload/sessions/{session_id}/chunks/{n}", content=chunk,
+                                     headers={"X-Chunk-SHA256": hashlib.sha256(chunk).hexdigest()})
+                if r.status_code != 200:
+                    return False
+            r = await client.post(f"/upload/sessions/{session_id}/complete",
+                                  data={"sha256": hashlib.sha256(big).hexdigest()})
+            return r.status_code == 200
+
+        scenarios["upload"] = await drive("upload", args.requests, args.concurrency, upload)
+        scenarios["upload_chunked"] = await drive(
+            "upload_chunked", max(1, args.requests // 20), args.concurrency, chunked_upload)
+
+        # 요약 작업이 끝날 때까지 기다리며 /jobs 조회 지연을 잰다
+        async def poll_job(i):
+            while True:
+                r = await client.get(f"/jobs/{job_ids[i]}")
+                if r.status_code != 200:
+                    return False
+                if r.json()["status"] in ("done", "failed"):
+                    return r.json()["status"] == "done"
+                await asyncio.sleep(0.05)
+
+        if job_ids:
+            scenarios["jobs"] = await drive("jobs", len(job_ids), args.concurrency, poll_job)
+
+        r = await client.get(f"/uploads/{UPLOAD_ID}")
+        etag = r.headers.get("ETag", "")
+
+        async def listing(i):
+            return (await client.get(f"/uploads/{UPLOAD_ID}")).status_code == 200
+
+        async def listing_etag(i):
+            r = await client.get(f"/uploads/{UPLOAD_ID}", headers={"If-None-Match": etag})
+            return r.status_code == 304
+
+        async def search(i):
+            r = await client.get(f"/search/{UPLOAD_ID}", params={"q": QUERIES[i % len(QUERIES)]})
+            return r.status_code == 200
+
+        async def preview(i):
+            # 같은 몇 장을 반복 요청해 첫 렌더링과 캐시 적중이 모두 섞이게 한다
+            r = await client.get(f"/preview/{UPLOAD_ID}/{SUBJECT}/1/lecture_0.pdf",
+                                 params={"page": i % args.pages + 1}, headers={"Accept": "image/webp"})
+            return r.status_code == 200
+
+        async def static_file(i):
+            offset = i * 4096 % max(1, len(big) - 65536)
+            r = await client.get(f"/files/{UPLOAD_ID}/{SUBJECT}/week_big/big_0.pdf",
+                                 headers={"Range": f"bytes={offset}-{offset + 65535}"})
+            return r.status_code in (200, 206)
+
+        async def download(i):
+            total = 0
+            async with client.stream("GET", f"/download/{UPLOAD_ID}") as r:
+                async for chunk in r.aiter_bytes():
+                    total += len(chunk)
+            return r.status_code == 200 and total > 0
+
+        async def due(i):
+            return (await client.get("/assignments/due", params={"days": 30})).status_code == 200
+
+        scenarios["uploads"] = await drive("uploads", args.requests, args.concurrency, listing)
+        scenarios["uploads_etag"] = await drive("uploads_etag", args.requests, args.concurrency, listing_etag)
+        scenarios["search"] = await drive("search", args.requests, args.concurrency, search)
+        scenarios["preview"] = await drive("preview", args.requests, args.concurrency, preview)
+        scenarios["files_range"] = await drive("files_range", args.requests, args.concurrency, static_file)
+        scenarios["download"] = await drive("download", max(1, args.requests // 20), args.concurrency, download)
+
+        # 과제 등록: 동시에 넣어도 하나도 빠지지 않았는지 함께 확인한다
+        r = await client.get(f"/uploads/{UPLOAD_ID}")
+        before = len(r.json().get("assignments", []))
+
+        async def assignment(i):
+            r = await client.post("/assignments", data={
+                "upload_id": UPLOAD_ID, "subject": SUBJECT, "title": f"bench {i}",
+                "deadline": time.strftime("%Y-%m-%d", time.localtime(time.time() + (i % 30) * 86400)),
+            })
+            return r.status_code == 200
+
+        scenarios["assignments"] = await drive("assignments", args.requests, args.concurrency, assignment)
+        r = await client.get(f"/uploads/{UPLOAD_ID}")
+        lost = before + args.requests - scenarios["assignments"]["errors"] - len(r.json().get("assignments", []))
+        scenarios["assignments_due"] = await drive("assignments_due", args.requests, args.concurrency, due)
+
+        async def scrape(i):
+            return (await client.get("/metrics")).status_code == 200
+
+        scenarios["metrics"] = await drive("metrics", args.requests, args.concurrency, scrape)
+        stages = parse_stage_means((await client.get("/metrics")).text)
+
+    return {
+        "config": {
+            "files": args.files, "pages": args.pages, "requests": args.requests,
+            "concurrency": args.concurrency, "seed": args.seed,
+        },
+        "scenarios": scenarios,
+        "stages": stages,
+        "checks": {"assignments_lost": lost},
+    }
+
+
+def positive_int(value: str) -> int:
+    """argparse type: 1 이상의 정수 (0이나 음수면 요청 수·평균 계산이 성립하지 않는다)."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"정수가 아닙니다: {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"1 이상이어야 합니다: {number}")
+    return number
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="엔드포인트별 처리량·지연시간 측정")
+    parser.add_argument("--url", help="측정할 서버 주소 (생략하면 임시 디렉터리에서 uvicorn을 띄운다)")
+    parser.add_argument("--files", type=positive_int, default=20, help="합성 PDF 수")
+    parser.add_argument("--pages", type=positive_int, default=10, help="PDF 하나의 페이지 수")
+    parser.add_argument("--requests", type=positive_int, default=200, help="시나리오별 요청 수")
+    parser.add_argument("--concurrency", type=positive_int, default=8, help="동시 요청 수")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="결과를 저장할 JSON 파일")
+    args = parser.parse_args()
+
+    if args.url:
+        report = asyncio.run(run(args.url.rstrip("/"), args))
+    else:
+        with tempfile.TemporaryDirectory() as workdir:
+            proc, url = start_server(workdir)
+            try:
+                report = asyncio.run(run(url, args))
+            finally:
+                proc.terminate()
+                proc.wait(timeout=30)
+
+    print(json.dumps(report["checks"], ensure_ascii=False))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,122 @@
+# backend/bench_search.py
+#
+# 전문 검색 색인의 코퍼스 크기별 검색 지연시간 측정
+#   python bench_search.py                     # 기본: 1,000 / 5,000 / 20,000 페이지
+#   python bench_search.py 2000 20000 --queries 500 --out bench_search.json
+
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from bench import positive_int
+from catalog import Catalog
+from search import SearchIndex
+
+# 합성 페이지를 만들 때 쓰는 어휘 (실제 강의 자료처럼 한글·영문이 섞이도록)
+KOREAN_WORDS = [
+    "디지털공학", "논리회로", "플립플롭", "카르노맵", "전자회로", "증폭기", "트랜지스터", "신호처리",
+    "푸리에변환", "라플라스", "미분방정식", "선형대수", "행렬", "고유값", "자료구조", "알고리즘",
+    "운영체제", "스케줄링", "메모리", "캐시", "파이프라인", "데이터베이스", "정규화", "트랜잭션",
+    "과제", "중간고사", "기말고사", "실습", "예제", "정리", "증명", "설계",
+]
+ENGLISH_WORDS = [
+    "mosfet", "cmos", "latch", "counter", "register", "fourier", "laplace", "matrix", "eigenvalue",
+    "stack", "queue", "heap", "graph", "kernel", "thread", "mutex", "cache", "index", "query",
+]
+QUERIES = ["디지털", "플립플롭", "공학", "회로 설계", "mosfet", "cache 메모리", "트랜잭션", "학", "eigenvalue 행렬"]
+
+PAGES_PER_DOC = 20
+WORDS_PER_PAGE = 150
+
+
+def _filler(rng: random.Random) -> str:
+    # 임의 음절로 만든 단어. 실제 자료처럼 어휘가 넓어야 검색어가 모든 페이지에 걸리지 않는다
+    return "".join(chr(0xAC00 + rng.randrange(11172)) for _ in range(rng.randint(2, 4)))
+
+
+def _page(rng: random.Random) -> str:
+    words = []
+    for _ in range(WORDS_PER_PAGE):
+        r = rng.random()
+        if r < 0.03:
+            words.append(rng.choice(KOREAN_WORDS))
+        elif r < 0.05:
+            words.append(rng.choice(ENGLISH_WORDS))
+        else:
+            words.append(_filler(rng))
+    return " ".join(words)
+
+
+def _percentile(samples: list, pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def run(total_pages: int, queries: int, seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        catalog_path = os.path.join(tmp, "catalog.sqlite3")
+        index_path = os.path.join(tmp, "search.sqlite3")
+        catalog = Catalog(catalog_path)
+        index = SearchIndex(index_path, catalog_path=catalog_path)
+
+        # 1) 색인 만들기: 문서 하나 = PDF 하나 (PAGES_PER_DOC 페이지), 절반은 검색 대상 upload_id에 연결
+        docs = max(1, total_pages // PAGES_PER_DOC)
+        build_start = time.perf_counter()
+        for d in range(docs):
+            digest = f"{d:064x}"
+            index.add_document(digest, [_page(rng) for _ in range(PAGES_PER_DOC)])
+            upload_id = "bench" if d % 2 == 0 else f"other{d % 50}"
+            catalog.record_files(upload_id, "디지털공학", str(d % 16 + 1), [
+                {"filename": f"lecture_{d}.pdf", "size": 0, "sha256": digest, "summary_status": "done"},
+            ])
+        build_seconds = time.perf_counter() - build_start
+
+        # 2) 검색 지연시간
+        latencies = []
+        hits = 0
+        for i in range(queries):
+            q = QUERIES[i % len(QUERIES)]
+            start = time.perf_counter()
+            hits += len(index.search("bench", q, limit=20))
+            latencies.append((time.perf_counter() - start) * 1000)
+
+        index.close()
+        catalog.close()
+        index_bytes = sum(
+            os.path.getsize(os.path.join(tmp, name)) for name in os.listdir(tmp) if name.startswith("search.sqlite3")
+        )
+
+    return {
+        "pages": docs * PAGES_PER_DOC,
+        "documents": docs,
+        "build_seconds": round(build_seconds, 3),
+        "index_bytes": index_bytes,
+        "queries": queries,
+        "avg_hits": round(hits / max(1, queries), 2),
+        "p50_ms": round(statistics.median(latencies), 3),
+        "p99_ms": round(_percentile(latencies, 99), 3),
+        "max_ms": round(max(latencies), 3),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="검색 색인 코퍼스 크기별 지연시간 측정")
+    parser.add_argument("sizes", nargs="*", type=positive_int, default=[1000, 5000, 20000], help="코퍼스 크기(페이지 수)")
+    parser.add_argument("--queries", type=positive_int, default=200, help="크기별 검색 횟수")
+    parser.add_argument("--out", help="결과를 저장할 JSON 파일")
+    args = parser.parse_args()
+
+    results = []
+    for size in args.sizes:
+        result = run(size, args.queries)
+        print(json.dumps(result, ensure_ascii=False))
+        results.append(result)
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,186 @@
+# backend/blobstore.py
+
+import hashlib
+import os
+import shutil
+import threading
+import time
+import uuid
+from typing import BinaryIO, Tuple
+
+# 파일을 읽어 해시를 계산하며 저장하는 단위 (바이트)
+CHUNK_SIZE = 1024 * 1024
+
+
+def link_or_copy(src: str, dst: str) -> None:
+    """
+    src를 dst 경로에서 보이게 합니다. 가능하면 하드링크, 안 되면(다른 파일시스템 등) 복사.
+    임시 이름으로 만든 뒤 교체하므로 dst에 기존 파일이 있어도 원자적으로 바뀝니다.
+    임시 이름은 LocalStorage 와 같은 .{파일명}.{uuid}.tmp 형식이라 목록·/files 에 보이지 않습니다.
+    """
+    directory, name = os.path.split(dst)
+    tmp_path = os.path.join(directory, f".{name}.{uuid.uuid4().hex}.tmp")
+    try:
+        os.link(src, tmp_path)
+    except OSError:
+        shutil.copyfile(src, tmp_path)
+    os.replace(tmp_path, dst)
+
+
+class BlobStore:
+    """
+    SHA-256 해시를 주소로 쓰는 중복 제거 저장소.
+
+    - objects/ab/abcdef…      : 파일 내용 (같은 내용은 한 번만 저장)
+    - summaries/abcdef….txt  : 해당 내용으로 만든 요약 (같은 PDF는 다시 파싱하지 않는다)
+    - tmp/                   : 해시 계산 중인 업로드
+
+    로컬 저장소(storage.LocalStorage)를 쓰면 ./uploads/{upload_id}/… 아래의 파일은 blob을 가리키는 하드링크입니다.
+    따라서 blob의 참조 수는 파일시스템의 링크 수(st_nlink - 1)와 같고,
+    어떤 upload_id도 가리키지 않는 blob은 gc()에서 지워집니다.
+    하드링크를 공유하므로 업로드 경로의 파일을 제자리에서 고쳐 쓰면 안 되고,
+    항상 새 파일을 만든 뒤 os.replace 로 교체해야 합니다.
+    S3 저장소를 쓰면 blob은 작업 프로세스가 읽을 로컬 사본일 뿐이므로 gc() 뒤에 필요하면 저장소에서 다시 받아 옵니다.
+
+    "이미 있으니 시각만 갱신"하는 쪽과 gc()의 "링크 수 확인 → 삭제"는 같은 잠금 안에서 실행되므로,
+    gc()가 확인한 직후 같은 내용이 다시 올라와도 그 blob을 지우지 않습니다
+    (갱신된 시각이 grace_seconds 안이라 다시 확인할 때 건너뛴다).
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self.objects_dir = os.path.join(root, "objects")
+        self.summaries_dir = os.path.join(root, "summaries")
+        self.tmp_dir = os.path.join(root, "tmp")
+        for path in (self.objects_dir, self.summaries_dir, self.tmp_dir):
+            os.makedirs(path, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def blob_path(self, digest: str) -> str:
+        return os.path.join(self.objects_dir, digest[:2], digest)
+
+    def summary_path(self, digest: str) -> str:
+        return os.path.join(self.summaries_dir, f"{digest}.txt")
+
+    def has_summary(self, digest: str) -> bool:
+        return os.path.isfile(self.summary_path(digest))
+
+    def touch(self, digest: str) -> bool:
+        """blob이 있으면 gc()가 지우지 않도록 시각을 갱신하고 True, 없으면 False를 돌려줍니다."""
+        with self._lock:
+            try:
+                os.utime(self.blob_path(digest))
+            except FileNotFoundError:
+                return False
+            return True
+
+    def put_stream(self, fileobj: BinaryIO, chunk_size: int = CHUNK_SIZE) -> Tuple[str, int]:
+        """
+        스트림을 디스크에 쓰면서 SHA-256을 계산하고, (해시, 크기)를 돌려줍니다.
+        이미 같은 내용의 blob이 있으면 새로 쓴 임시 파일은 버립니다.
+        """
+        sha = hashlib.sha256()
+        size = 0
+        tmp_path = os.path.join(self.tmp_dir, uuid.uuid4().hex)
+        try:
+            with open(tmp_path, "wb") as out_f:
+                while True:
+                    data = fileobj.read(chunk_size)
+                    if not data:
+                        break
+                    sha.update(data)
+                    out_f.write(data)
+                    size += len(data)
+            digest = sha.hexdigest()
+            path = self.blob_path(digest)
+            with self._lock:
+                if os.path.exists(path):
+                    # 중복: gc()가 방금 쓰인 blob을 지우지 않도록 시각만 갱신
+                    os.utime(path)
+                else:
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return digest, size
+
+    def put_file(self, path: str, chunk_size: int = CHUNK_SIZE) -> Tuple[str, int]:
+        """
+        이미 디스크에 있는 파일(이어받기 업로드로 완성된 .part 등)을 해시를 계산해 blob으로 옮깁니다.
+        같은 파일시스템이면 이름만 바꾸므로 다시 쓰지 않습니다. 원본 path는 사라집니다.
+        """
+        sha = hashlib.sha256()
+        size = 0
+        with open(path, "rb") as f:
+            while True:
+                data = f.read(chunk_size)
+                if not data:
+                    break
+                sha.update(data)
+                size += len(data)
+        digest = sha.hexdigest()
+        blob_path = self.blob_path(digest)
+        with self._lock:
+            if os.path.exists(blob_path):
+                os.utime(blob_path)
+                os.remove(path)
+            else:
+                os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+                try:
+                    os.replace(path, blob_path)
+                except OSError:
+                    # 다른 파일시스템이면 복사 후 원본 삭제
+                    shutil.copyfile(path, blob_path)
+                    os.remove(path)
+        return digest, size
+
+    def gc(self, grace_seconds: float = 3600) -> int:
+        """
+        어떤 업로드 경로도 가리키지 않는 blob(링크 수 1)과 그 요약, 남은 임시 파일을 지우고
+        지운 blob 수를 돌려줍니다. 방금 저장돼 아직 연결되지 않은 blob을 지우지 않도록
+        grace_seconds 보다 최근에 바뀐 항목은 건너뜁니다.
+        """
+        now = time.time()
+        removed = 0
+
+        def is_stale(st) -> bool:
+            return now - max(st.st_mtime, st.st_ctime) >= grace_seconds
+
+        for prefix in os.listdir(self.objects_dir):
+            prefix_dir = os.path.join(self.objects_dir, prefix)
+            if not os.path.isdir(prefix_dir):
+                continue
+            for digest in os.listdir(prefix_dir):
+                path = os.path.join(prefix_dir, digest)
+                # 확인과 삭제 사이에 put_stream()/put_file()/touch()가 끼어들지 못하게 blob 하나씩 잠근다
+                with self._lock:
+                    try:
+                        st = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    if st.st_nlink <= 1 and is_stale(st):
+                        os.remove(path)
+                        removed += 1
+
+        # blob이 사라진 요약은 더 이상 재사용될 일이 없다
+        for name in os.listdir(self.summaries_dir):
+            digest = name[:-len(".txt")] if name.endswith(".txt") else name
+            if not os.path.exists(self.blob_path(digest)):
+                path = os.path.join(self.summaries_dir, name)
+                try:
+                    if is_stale(os.stat(path)):
+                        os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+        # 업로드 도중 서버가 죽어 남은 임시 파일
+        for name in os.listdir(self.tmp_dir):
+            path = os.path.join(self.tmp_dir, name)
+            try:
+                if is_stale(os.stat(path)):
+                    os.remove(path)
+            except FileNotFoundError:
+                pass
+
+        return removed
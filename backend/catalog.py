@@ -0,0 +1,250 @@
+# backend/catalog.py
+
+import hashlib
+import os
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Iterable, Optional
+
+from jobs import JOB_DONE
+from storage import is_temp_name
+from summary import summary_filename_for
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS uploads (
+    upload_id TEXT PRIMARY KEY,
+    version   INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS files (
+    upload_id      TEXT NOT NULL,
+    subject        TEXT NOT NULL,
+    week           TEXT NOT NULL,
+    filename       TEXT NOT NULL,
+    size           INTEGER NOT NULL,
+    sha256         TEXT,
+    summary_status TEXT,
+    mtime          REAL NOT NULL,
+    PRIMARY KEY (upload_id, subject, week, filename)
+);
+CREATE INDEX IF NOT EXISTS files_sha256 ON files (sha256, upload_id);
+-- 과제는 저널(assignments.AssignmentStore)에만 저장한다. 예전에 함께 기록하던 사본은 지운다
+DROP TABLE IF EXISTS assignments;
+"""
+
+
+class Catalog:
+    """
+    업로드 파일의 메타데이터 목록(SQLite)과 upload_id별 version.
+
+    /upload 는 트랜잭션 안에서 목록을 갱신하면서 upload_id별 version을 1씩 올리고,
+    /uploads/{upload_id} 는 디렉터리를 순회하지 않고 색인된 조회만으로 응답합니다.
+    과제 자체는 저널(AssignmentStore)에만 저장하고, 여기서는 /assignments 가 저널에 쓴 뒤 version만 올립니다.
+    version은 ETag로 쓰이므로 내용이 바뀌지 않았다면 304로 끝납니다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        # ETag 앞에 붙는 epoch는 서버를 시작할 때마다 바꾼다. 저널에 쓴 직후 version을 올리기 전에
+        # 서버가 죽었더라도, 재시작 후에는 이전 ETag가 맞지 않아 바뀐 내용을 다시 받아 가게 된다
+        self.epoch = uuid.uuid4().hex[:12]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # -------- 쓰기 --------
+
+    @contextmanager
+    def _transaction(self):
+        """BEGIN IMMEDIATE ~ COMMIT/ROLLBACK (호출 측에서 self._lock 을 잡는다)."""
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self._conn
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    @staticmethod
+    def _bump(conn, upload_id: str) -> None:
+        conn.execute(
+            "INSERT INTO uploads (upload_id, version) VALUES (?, 1) "
+            "ON CONFLICT(upload_id) DO UPDATE SET version = version + 1",
+            (upload_id,),
+        )
+
+    def record_files(self, upload_id: str, subject: str, week: str, entries: Iterable[dict]) -> None:
+        """
+        한 번의 /upload 로 저장된 파일들을 기록합니다.
+        - entries: {"filename", "size", "sha256", "summary_status"} 목록
+        같은 경로에 다시 올라온 파일은 덮어씁니다.
+        """
+        now = time.time()
+        with self._lock, self._transaction() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO files "
+                "(upload_id, subject, week, filename, size, sha256, summary_status, mtime) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (upload_id, subject, week, e["filename"], e["size"], e.get("sha256"),
+                     e.get("summary_status"), e.get("mtime", now))
+                    for e in entries
+                ],
+            )
+            self._bump(conn, upload_id)
+
+    def set_summary_status(self, upload_id: str, subject: str, week: str, filename: str, status: str) -> None:
+        with self._lock, self._transaction() as conn:
+            conn.execute(
+                "UPDATE files SET summary_status = ? "
+                "WHERE upload_id = ? AND subject = ? AND week = ? AND filename = ?",
+                (status, upload_id, subject, week, filename),
+            )
+            self._bump(conn, upload_id)
+
+    def touch(self, upload_id: str) -> None:
+        """목록 밖(과제 저널)의 내용이 바뀌었을 때 version만 올립니다."""
+        with self._lock, self._transaction() as conn:
+            self._bump(conn, upload_id)
+
+    # -------- 읽기 --------
+
+    def etag(self, version: int) -> str:
+        return f'"{self.epoch}-{version}"'
+
+    def version(self, upload_id: str) -> Optional[int]:
+        """upload_id의 현재 version (한 번도 기록된 적 없으면 None)."""
+        with self._lock:
+            row = self._conn.execute("SELECT version FROM uploads WHERE upload_id = ?", (upload_id,)).fetchone()
+        return None if row is None else row[0]
+
+    def file_digest(self, upload_id: str, subject: str, week: str, filename: str) -> Optional[str]:
+        """업로드 경로에 있는 파일의 SHA-256 (목록에 없으면 None)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT sha256 FROM files WHERE upload_id = ? AND subject = ? AND week = ? AND filename = ?",
+                (upload_id, subject, week, filename),
+            ).fetchone()
+        return None if row is None else row[0]
+
+    def listing(self, upload_id: str) -> Optional[tuple]:
+        """
+        (version, 파일 목록) 을 돌려줍니다. 형식은 기존 /uploads/{upload_id} 응답에서 과제를 뺀 것과 같습니다.
+        {"과목": {"주차": ["lecture.pdf", "lecture_summary.txt", …]}}
+        요약 파일은 기존처럼 모든 파일 옆에 함께 보여줍니다 (요약 작업이 진행 중이면 아직 내용이 없을 수 있다).
+        """
+        with self._lock:
+            # 같은 읽기 트랜잭션 안에서 조회해 version과 내용이 어긋나지 않게 한다
+            self._conn.execute("BEGIN")
+            try:
+                row = self._conn.execute("SELECT version FROM uploads WHERE upload_id = ?", (upload_id,)).fetchone()
+                if row is None:
+                    return None
+                files = self._conn.execute(
+                    "SELECT subject, week, filename FROM files "
+                    "WHERE upload_id = ? ORDER BY subject, week, filename",
+                    (upload_id,),
+                ).fetchall()
+            finally:
+                self._conn.execute("COMMIT")
+
+        result = {}
+        for subject, week, filename in files:
+            file_list = result.setdefault(subject, {}).setdefault(week, [])
+            file_list.append(filename)
+            file_list.append(summary_filename_for(filename))
+        return row[0], result
+
+    # -------- 기존 디렉터리 가져오기 --------
+
+    def import_tree(self, upload_root: str) -> int:
+        """
+        ./uploads 디렉터리 구조를 목록과 맞추고, 바뀐 upload_id 수를 돌려줍니다 (서버 시작 시마다 실행).
+        {upload_id}/{subject}/week_{n}/파일 을 대상으로 하며 (과제는 저널에서 바로 읽으므로 가져오지 않는다),
+        원본과 짝이 맞는 *_summary.txt 는 별도 파일이 아닌 요약 상태(done)로 기록합니다.
+        - 목록에 없거나 크기·수정 시각이 달라진 파일만 해시를 계산해 추가(덮어쓰기)
+        - 디스크에서 사라진 파일은 목록에서도 지운다
+        """
+        count = 0
+        for upload_id in sorted(os.listdir(upload_root)):
+            target_dir = os.path.join(upload_root, upload_id)
+            if not os.path.isdir(target_dir):
+                continue
+
+            with self._lock:
+                known = {
+                    (subject, week, filename): (size, mtime)
+                    for subject, week, filename, size, mtime in self._conn.execute(
+                        "SELECT subject, week, filename, size, mtime FROM files WHERE upload_id = ?", (upload_id,))
+                }
+            found = set()
+            changed = []
+            for subject in sorted(os.listdir(target_dir)):
+                subject_path = os.path.join(target_dir, subject)
+                if not os.path.isdir(subject_path):
+                    continue
+                for week_folder in sorted(os.listdir(subject_path)):
+                    week_path = os.path.join(subject_path, week_folder)
+                    if not os.path.isdir(week_path):
+                        continue
+                    week = week_folder.replace("week_", "")
+                    names = {
+                        fname for fname in os.listdir(week_path)
+                        if os.path.isfile(os.path.join(week_path, fname)) and not is_temp_name(fname)
+                    }
+                    summaries = {summary_filename_for(n) for n in names} & names
+                    for fname in sorted(names - summaries):
+                        file_path = os.path.join(week_path, fname)
+                        st = os.stat(file_path)
+                        found.add((subject, week, fname))
+                        # 같은 크기의 다른 파일로 바뀌었을 수도 있으므로 수정 시각도 비교한다
+                        if known.get((subject, week, fname)) == (st.st_size, st.st_mtime):
+                            continue
+                        changed.append((upload_id, subject, week, fname, st.st_size, _hash_file(file_path),
+                                        JOB_DONE if summary_filename_for(fname) in names else None, st.st_mtime))
+            removed = [(upload_id, *key) for key in known.keys() - found]
+
+            # 바뀐 것이 없으면 version을 올리지 않는다 (ETag가 유지된다).
+            # 빈 디렉터리라도 존재했던 upload_id는 404가 아니라 빈 목록으로 응답하도록 등록
+            if not changed and not removed and self.version(upload_id) is not None:
+                continue
+            with self._lock, self._transaction() as conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO files "
+                    "(upload_id, subject, week, filename, size, sha256, summary_status, mtime) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    changed,
+                )
+                conn.executemany(
+                    "DELETE FROM files WHERE upload_id = ? AND subject = ? AND week = ? AND filename = ?",
+                    removed,
+                )
+                self._bump(conn, upload_id)
+            count += 1
+        return count
+
+
+def _hash_file(path: str) -> str:
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+if __name__ == "__main__":
+    # 목록 맞추기를 따로 실행: python catalog.py [uploads 디렉터리] [카탈로그 파일]
+    upload_root = sys.argv[1] if len(sys.argv) > 1 else "./uploads"
+    catalog_path = sys.argv[2] if len(sys.argv) > 2 else "./catalog.sqlite3"
+    catalog = Catalog(catalog_path)
+    print(f"{catalog.import_tree(upload_root)}개의 upload_id를 갱신했습니다.")
+    catalog.close()
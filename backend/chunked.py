@@ -0,0 +1,242 @@
+# backend/chunked.py
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+import uuid
+from typing import AsyncIterator, Optional
+
+# 청크 크기 기본값과 허용 범위 (바이트)
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024
+MIN_CHUNK_SIZE = 256 * 1024
+MAX_CHUNK_SIZE = 64 * 1024 * 1024
+
+
+class ChunkError(Exception):
+    """받은 청크가 잘못되었을 때 (크기 불일치, 체크섬 불일치 등) 발생합니다."""
+
+
+def part_filename(session_id: str) -> str:
+    # 저장소의 임시 파일 이름(storage.is_temp_name): 목록·ZIP·/files 에서 제외된다
+    return f".{session_id}.part"
+
+
+class UploadSession:
+    """
+    이어받기 가능한 업로드 세션 하나.
+    파일은 목적지 week_{n}/ 디렉터리 안의 .part 파일에 청크별 위치(offset)로 바로 기록됩니다.
+    """
+
+    def __init__(self, data: dict):
+        self.session_id = data["session_id"]
+        self.upload_id = data["upload_id"]
+        self.subject = data["subject"]
+        self.week = data["week"]
+        self.filename = data["filename"]
+        self.size = data["size"]
+        self.chunk_size = data["chunk_size"]
+        self.base_path = data["base_path"]
+        self.received = set(data.get("received", []))
+        self.created_at = data.get("created_at", time.time())
+        self.updated_at = data.get("updated_at", self.created_at)
+        # 완료 처리 중이면 더 이상 청크를 받지 않는다 (메모리에만 둔다)
+        self.finalizing = False
+        # 지금 쓰고 있는 청크 요청 수 (쓰는 도중에는 완료 처리하지 않는다)
+        self.writers = 0
+        # 지금 쓰고 있는 청크 번호 (같은 청크를 동시에 두 요청이 덮어쓰지 않게 한다)
+        self.writing = set()
+        self.lock = asyncio.Lock()
+
+    @property
+    def total_chunks(self) -> int:
+        return max(1, -(-self.size // self.chunk_size))
+
+    @property
+    def part_path(self) -> str:
+        return os.path.join(self.base_path, part_filename(self.session_id))
+
+    def chunk_range(self, index: int) -> tuple:
+        """index번째 청크의 (offset, 길이)."""
+        offset = index * self.chunk_size
+        return offset, min(self.chunk_size, self.size - offset)
+
+    def missing(self) -> list:
+        return [i for i in range(self.total_chunks) if i not in self.received]
+
+    def to_dict(self) -> dict:
+        return {
+            "session_id": self.session_id,
+            "upload_id": self.upload_id,
+            "subject": self.subject,
+            "week": self.week,
+            "filename": self.filename,
+            "size": self.size,
+            "chunk_size": self.chunk_size,
+            "base_path": self.base_path,
+            "received": sorted(self.received),
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+        }
+
+    def status(self, expires_at: float) -> dict:
+        return {
+            "session_id": self.session_id,
+            "upload_id": self.upload_id,
+            "subject": self.subject,
+            "week": self.week,
+            "filename": self.filename,
+            "size": self.size,
+            "chunk_size": self.chunk_size,
+            "total_chunks": self.total_chunks,
+            "received": sorted(self.received),
+            "missing": self.missing(),
+            "expires_at": expires_at,
+        }
+
+
+class UploadSessionStore:
+    """
+    업로드 세션 목록. 세션 정보는 root/{session_id}.json 에 저장해 서버를 재시작해도 이어받을 수 있고,
+    ttl 초 동안 청크가 오지 않은 세션은 expire()에서 .part 파일과 함께 지웁니다.
+    """
+
+    def __init__(self, root: str, ttl: float = 24 * 3600):
+        self.root = root
+        self.ttl = ttl
+        os.makedirs(root, exist_ok=True)
+        self._sessions = {}
+        for name in os.listdir(root):
+            if not name.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(root, name), "r", encoding="utf-8") as f:
+                    session = UploadSession(json.load(f))
+            except (OSError, ValueError, KeyError):
+                continue
+            self._sessions[session.session_id] = session
+
+    def _meta_path(self, session_id: str) -> str:
+        return os.path.join(self.root, f"{session_id}.json")
+
+    def _save(self, session: UploadSession) -> None:
+        path = self._meta_path(session.session_id)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(session.to_dict(), f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def create(self, upload_id: str, subject: str, week: str, filename: str,
+               size: int, chunk_size: int, base_path: str) -> UploadSession:
+        session = UploadSession({
+            "session_id": uuid.uuid4().hex,
+            "upload_id": upload_id,
+            "subject": subject,
+            "week": week,
+            "filename": filename,
+            "size": size,
+            "chunk_size": chunk_size,
+            "base_path": base_path,
+        })
+        os.makedirs(base_path, exist_ok=True)
+        # 최종 크기로 미리 만들어 두면 청크를 어떤 순서로 받아도 제자리에 쓸 수 있다
+        with open(session.part_path, "wb") as f:
+            f.truncate(size)
+        self._save(session)
+        self._sessions[session.session_id] = session
+        return session
+
+    def get(self, session_id: str) -> Optional[UploadSession]:
+        return self._sessions.get(session_id)
+
+    def expires_at(self, session: UploadSession) -> float:
+        return session.updated_at + self.ttl
+
+    def status(self, session: UploadSession) -> dict:
+        return session.status(self.expires_at(session))
+
+    async def write_chunk(self, session: UploadSession, index: int,
+                          stream: AsyncIterator[bytes], expected_sha256: str) -> None:
+        """
+        요청 본문(stream)을 .part 파일의 해당 위치(offset)에 바로 쓰면서 SHA-256을 계산합니다.
+        디스크 쓰기는 스레드에서 처리하며, 청크를 메모리나 임시 파일에 따로 모아 두지 않습니다.
+        쓰기 전에 받지 않은 것으로 표시해 두므로, 길이나 체크섬이 맞지 않으면(ChunkError)
+        이미 받은 청크였더라도 그 청크는 다시 보내야 합니다.
+        """
+        if session.finalizing:
+            raise ChunkError("이미 완료 처리 중인 세션입니다.")
+        if not 0 <= index < session.total_chunks:
+            raise ChunkError(f"청크 번호는 0 ~ {session.total_chunks - 1} 이어야 합니다.")
+        if index in session.writing:
+            raise ChunkError(f"청크 {index}를 이미 받고 있습니다.")
+        offset, length = session.chunk_range(index)
+
+        sha = hashlib.sha256()
+        written = 0
+        session.writers += 1
+        session.writing.add(index)
+        try:
+            # 덮어쓰는 도중 실패하거나 서버가 죽어도 받은 것으로 남지 않도록 먼저 표시를 지운다
+            await self._mark(session, index, received=False)
+            f = await asyncio.to_thread(open, session.part_path, "r+b")
+            try:
+                await asyncio.to_thread(f.seek, offset)
+                async for data in stream:
+                    if not data:
+                        continue
+                    written += len(data)
+                    if written > length:
+                        # 다음 청크 자리를 덮어쓰지 않도록 쓰기 전에 멈춘다
+                        raise ChunkError(f"청크 {index}의 크기는 {length}바이트여야 합니다.")
+                    sha.update(data)
+                    await asyncio.to_thread(f.write, data)
+            finally:
+                await asyncio.to_thread(f.close)
+            if written != length:
+                raise ChunkError(f"청크 {index}의 크기는 {length}바이트여야 합니다. (받은 크기: {written})")
+            if sha.hexdigest() != expected_sha256.strip().lower():
+                raise ChunkError(f"청크 {index}의 체크섬이 일치하지 않습니다.")
+            await self._mark(session, index, received=True)
+        finally:
+            session.writing.discard(index)
+            session.writers -= 1
+
+    async def _mark(self, session: UploadSession, index: int, received: bool) -> None:
+        async with session.lock:
+            if received:
+                session.received.add(index)
+            elif index in session.received:
+                session.received.discard(index)
+            else:
+                return
+            session.updated_at = time.time()
+            await asyncio.to_thread(self._save, session)
+
+    def remove(self, session: UploadSession, keep_part: bool = False) -> None:
+        """세션 정보를 지웁니다. keep_part=False 면 .part 파일도 함께 지운다."""
+        self._sessions.pop(session.session_id, None)
+        paths = [self._meta_path(session.session_id)]
+        if not keep_part:
+            paths.append(session.part_path)
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    async def expire(self) -> int:
+        """오래 방치된 세션을 지우고 그 수를 돌려줍니다."""
+        now = time.time()
+        expired = 0
+        for session in list(self._sessions.values()):
+            async with session.lock:
+                if session.finalizing or session.writers or now < self.expires_at(session):
+                    continue
+                # 지우는 동안 새 청크를 받지 않도록 막는다
+                session.finalizing = True
+                self._sessions.pop(session.session_id, None)
+            await asyncio.to_thread(self.remove, session)
+            expired += 1
+        return expired
+
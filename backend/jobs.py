@@ -0,0 +1,268 @@
+# backend/jobs.py
+
+import asyncio
+import inspect
+import logging
+import multiprocessing
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from metrics import registry
+
+# 작업 상태 값
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+logger = logging.getLogger(__name__)
+
+# 작업 큐 공통 지표 (queue 라벨로 요약/미리보기 큐를 구분)
+job_wait = registry.histogram("lecture_job_wait_seconds", "작업이 대기열에서 기다린 시간", ("queue",))
+job_run = registry.histogram("lecture_job_run_seconds", "작업 실행 시간", ("queue", "status"))
+jobs_finished = registry.counter("lecture_jobs_total", "끝난 작업 수", ("queue", "status"))
+jobs_rejected = registry.counter("lecture_jobs_rejected_total", "대기열이 가득 차 거절된 작업 수", ("queue",))
+
+
+class JobQueueFull(Exception):
+    """대기열이 가득 차서 새 작업을 받을 수 없을 때 발생합니다."""
+
+
+class JobTimeout(Exception):
+    """작업이 제한 시간 안에 끝나지 않았을 때 발생합니다."""
+
+
+class Job:
+    """
+    작업 하나의 상태를 담는 객체. /jobs/{job_id} 응답은 to_dict() 결과를 그대로 사용합니다.
+    """
+
+    def __init__(self, func: Callable, args: tuple, callback: Optional[Callable] = None):
+        self.job_id = uuid.uuid4().hex
+        self.func = func
+        self.args = args
+        self.callback = callback
+        self.status = JOB_QUEUED
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._finished = asyncio.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (JOB_DONE, JOB_FAILED)
+
+    async def wait(self) -> "Job":
+        """작업이 끝날 때까지(성공/실패 무관) 기다립니다."""
+        await self._finished.wait()
+        return self
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+def _worker_main(conn) -> None:
+    """
+    작업 프로세스의 메인 루프: (함수, 인자)를 받아 실행하고 결과를 돌려보냅니다.
+    None을 받거나 파이프가 닫히면 종료합니다.
+    """
+    while True:
+        try:
+            task = conn.recv()
+        except (EOFError, OSError):
+            break
+        if task is None:
+            break
+        func, args = task
+        try:
+            conn.send(("ok", func(*args)))
+        except Exception as e:
+            conn.send(("error", str(e) or type(e).__name__))
+
+
+class _Worker:
+    """
+    전용 자식 프로세스 하나를 소유하는 작업자.
+    ProcessPoolExecutor와 달리 시간 초과된 작업만 골라 프로세스를 종료하고 새로 띄울 수 있습니다.
+    """
+
+    def __init__(self, ctx, executor: ThreadPoolExecutor):
+        self._ctx = ctx
+        self._executor = executor
+        self._proc = None
+        self._conn = None
+
+    def _ensure_started(self) -> None:
+        if self._proc is not None and self._proc.is_alive():
+            return
+        self.kill()
+        parent_conn, child_conn = self._ctx.Pipe()
+        proc = self._ctx.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        proc.start()
+        child_conn.close()
+        self._proc, self._conn = proc, parent_conn
+
+    async def run(self, func: Callable, args: tuple, timeout: float) -> Any:
+        self._ensure_started()
+        self._conn.send((func, args))
+        # poll()은 블로킹 호출이므로 스레드에서 기다려 이벤트 루프를 막지 않는다.
+        # 작업 내내 스레드를 붙잡으므로 asyncio.to_thread 의 공용 풀이 아닌 큐 전용 풀을 쓴다
+        # (공용 풀을 다 차지하면 업로드 저장·ZIP 압축 등 다른 to_thread 호출이 모두 멈춘다)
+        ready = await asyncio.get_running_loop().run_in_executor(self._executor, self._conn.poll, timeout)
+        if not ready:
+            self.kill()
+            raise JobTimeout(f"{timeout:g}초 안에 끝나지 않았습니다.")
+        try:
+            status, payload = self._conn.recv()
+        except (EOFError, OSError):
+            # 자식 프로세스가 비정상 종료된 경우 (메모리 부족 등)
+            self.kill()
+            raise RuntimeError("작업 프로세스가 비정상 종료되었습니다.")
+        if status == "error":
+            raise RuntimeError(payload)
+        return payload
+
+    def stop(self) -> None:
+        if self._conn is not None and self._proc is not None and self._proc.is_alive():
+            try:
+                self._conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            self._proc.join(timeout=1)
+        self.kill()
+
+    def kill(self) -> None:
+        if self._proc is not None:
+            if self._proc.is_alive():
+                self._proc.kill()
+            self._proc.join(timeout=1)
+        if self._conn is not None:
+            self._conn.close()
+        self._proc, self._conn = None, None
+
+
+class JobQueue:
+    """
+    크기가 제한된 대기열 + 프로세스 작업자 풀.
+    - name: 지표(metrics)에 쓰이는 큐 이름
+    - workers: 동시에 실행할 작업 프로세스 수
+    - max_queued: 대기열에 쌓아 둘 수 있는 최대 작업 수 (넘으면 JobQueueFull)
+    - timeout: 작업 하나에 허용하는 최대 실행 시간(초). 넘으면 해당 프로세스를 종료한다
+    - max_history: 끝난 작업의 상태를 메모리에 보관할 최대 개수
+    """
+
+    def __init__(self, name: str, workers: int = 2, max_queued: int = 64, timeout: float = 30.0,
+                 max_history: int = 1000):
+        self.name = name
+        self.workers = workers
+        self.max_queued = max_queued
+        self.timeout = timeout
+        self.max_history = max_history
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks = []
+        self._workers = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    async def start(self) -> None:
+        # Windows/macOS와 동작을 맞추고, 스레드가 있는 서버 프로세스의 fork를 피하기 위해 spawn 사용
+        ctx = multiprocessing.get_context("spawn")
+        self._queue = asyncio.Queue(maxsize=self.max_queued)
+        # 작업자마다 결과를 기다리는 스레드 하나 (add_reader는 Windows 기본 루프에서 쓸 수 없다)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=f"jobs-{self.name}")
+        for _ in range(self.workers):
+            worker = _Worker(ctx, self._executor)
+            self._workers.append(worker)
+            self._tasks.append(asyncio.create_task(self._consume(worker)))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        for worker in self._workers:
+            await asyncio.to_thread(worker.stop)
+        self._tasks, self._workers = [], []
+        if self._executor is not None:
+            # 프로세스를 종료했으므로 기다리던 poll()도 곧 끝난다
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    @property
+    def queued(self) -> int:
+        return 0 if self._queue is None else self._queue.qsize()
+
+    def has_capacity(self, count: int = 1) -> bool:
+        return self._queue is not None and self._queue.maxsize - self._queue.qsize() >= count
+
+    def submit(self, func: Callable, *args, callback: Optional[Callable] = None) -> Job:
+        """
+        작업을 대기열에 넣고 즉시 Job을 돌려줍니다.
+        func는 자식 프로세스에서 실행되므로 모듈 최상위 함수여야 합니다(pickle 가능).
+        callback(job)은 작업이 끝나면(성공/실패 무관) 이벤트 루프에서 호출됩니다.
+        """
+        if self._queue is None:
+            raise RuntimeError("작업 큐가 시작되지 않았습니다.")
+        job = Job(func, args, callback)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            jobs_rejected.inc(queue=self.name)
+            raise JobQueueFull(f"{self.name} 작업 대기열이 가득 찼습니다.")
+        self._remember(job)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def _remember(self, job: Job) -> None:
+        self._jobs[job.job_id] = job
+        # 오래된 '끝난' 작업부터 정리 (진행 중인 작업은 남겨 둔다)
+        if len(self._jobs) > self.max_history:
+            for old_id in list(self._jobs):
+                if len(self._jobs) <= self.max_history:
+                    break
+                if self._jobs[old_id].finished:
+                    del self._jobs[old_id]
+
+    async def _consume(self, worker: _Worker) -> None:
+        while True:
+            job = await self._queue.get()
+            job.status = JOB_RUNNING
+            job.started_at = time.time()
+            job_wait.observe(job.started_at - job.created_at, queue=self.name)
+            try:
+                job.result = await worker.run(job.func, job.args, self.timeout)
+                job.status = JOB_DONE
+            except asyncio.CancelledError:
+                worker.kill()
+                raise
+            except Exception as e:
+                job.error = str(e) or type(e).__name__
+                job.status = JOB_FAILED
+            finally:
+                job.finished_at = time.time()
+                self._queue.task_done()
+            job_run.observe(job.finished_at - job.started_at, queue=self.name, status=job.status)
+            jobs_finished.inc(queue=self.name, status=job.status)
+            # 콜백을 먼저 실행해 wait()로 기다리던 쪽이 콜백의 결과(요약 파일 등)를 보게 한다.
+            # 콜백이 코루틴을 돌려주면(저장소에 쓰는 경우 등) 끝날 때까지 기다린다
+            if job.callback is not None:
+                try:
+                    pending = job.callback(job)
+                    if inspect.isawaitable(pending):
+                        await pending
+                except Exception:
+                    logger.exception("작업 콜백 실행 실패: %s", job.job_id)
+            job._finished.set()
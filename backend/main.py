@@ -1,24 +1,120 @@
 # backend/main.py
 
 import os
-import shutil
+import asyncio
 import json
-import io
-import zipfile
-from typing import List
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException
-from fastapi.responses import JSONResponse, StreamingResponse
-from fastapi.staticfiles import StaticFiles
+import logging
+import mimetypes
+import time
+import uuid
+from contextlib import asynccontextmanager
+from email.utils import formatdate
+from typing import List, Optional
+from fastapi import FastAPI, UploadFile, File, Form, Header, HTTPException, Request
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-import pdfplumber
+
+from assignments import COMPACTING_FILENAME, JOURNAL_FILENAME, SNAPSHOT_FILENAME, AssignmentStore
+from blobstore import BlobStore
+from catalog import Catalog
+from chunked import ChunkError, DEFAULT_CHUNK_SIZE, MAX_CHUNK_SIZE, MIN_CHUNK_SIZE, UploadSessionStore
+from jobs import JobQueue, JobQueueFull, JOB_DONE, JOB_FAILED
+from metrics import MetricsMiddleware, bytes_sent, cache_events, monitor_event_loop_lag, registry, stage, stage_duration
+from preview import DEFAULT_WIDTH, FORMATS, PreviewCache, cache_key, normalize_width, render_page
+from search import SearchIndex
+from storage import InvalidKey, RangeNotSatisfiable, check_key, create_storage, is_temp_name, parse_range
+from summary import EMPTY_SUMMARY, index_pdf, process_pdf, summary_filename_for
+from zipstream import ZipCache, aiter_zip
+
+logger = logging.getLogger(__name__)
 
 # -----------------------------------
 # 1) 기본 설정
 # -----------------------------------
+# PDF 요약 작업 큐 설정 (환경 변수로 조정 가능)
+SUMMARY_WORKERS = int(os.environ.get("SUMMARY_WORKERS", "2"))          # 동시에 파싱할 프로세스 수
+SUMMARY_QUEUE_SIZE = int(os.environ.get("SUMMARY_QUEUE_SIZE", "64"))   # 대기열 최대 길이
+SUMMARY_TIMEOUT = float(os.environ.get("SUMMARY_TIMEOUT", "30"))       # 작업 하나당 제한 시간(초)
+
+# CPU를 많이 쓰는 PDF 파싱은 이벤트 루프 밖의 프로세스 풀에서 처리한다
+summary_jobs = JobQueue(
+    "summary",
+    workers=SUMMARY_WORKERS,
+    max_queued=SUMMARY_QUEUE_SIZE,
+    timeout=SUMMARY_TIMEOUT,
+)
+
+# 전체 페이지 검색 색인 작업 큐 설정. 페이지가 많은 PDF는 오래 걸리므로 요약과 따로 돌리고 제한 시간도 따로 둔다
+INDEX_WORKERS = int(os.environ.get("INDEX_WORKERS", "1"))
+INDEX_QUEUE_SIZE = int(os.environ.get("INDEX_QUEUE_SIZE", "256"))
+INDEX_TIMEOUT = float(os.environ.get("INDEX_TIMEOUT", "300"))
+
+# 색인이 실패하거나 밀려도 요약(첫 페이지들)은 먼저 끝나도록 별도의 풀에서 실행한다
+index_jobs = JobQueue(
+    "index",
+    workers=INDEX_WORKERS,
+    max_queued=INDEX_QUEUE_SIZE,
+    timeout=INDEX_TIMEOUT,
+)
+
+# 페이지 미리보기 렌더링 작업 큐와 디스크 캐시 설정
+PREVIEW_WORKERS = int(os.environ.get("PREVIEW_WORKERS", "2"))
+PREVIEW_QUEUE_SIZE = int(os.environ.get("PREVIEW_QUEUE_SIZE", "64"))
+PREVIEW_TIMEOUT = float(os.environ.get("PREVIEW_TIMEOUT", "20"))
+PREVIEW_CACHE_BYTES = int(os.environ.get("PREVIEW_CACHE_BYTES", str(256 * 1024 * 1024)))   # 캐시 최대 크기
+
+# 미리보기는 요약과 별도의 풀에서 렌더링해, 요약 작업이 밀려도 미리보기가 기다리지 않게 한다
+preview_jobs = JobQueue(
+    "preview",
+    workers=PREVIEW_WORKERS,
+    max_queued=PREVIEW_QUEUE_SIZE,
+    timeout=PREVIEW_TIMEOUT,
+)
+
+# 참조가 끊긴 blob 정리, 과제 저널 압축, 방치된 업로드 세션 정리를 실행하는 주기(초)
+MAINTENANCE_INTERVAL = float(os.environ.get("MAINTENANCE_INTERVAL", "3600"))
+
+
+async def _run_maintenance_periodically():
+    while True:
+        await asyncio.to_thread(blob_store.gc)
+        await asyncio.to_thread(assignment_store.compact_all)
+        await upload_sessions.expire()
+        await asyncio.sleep(MAINTENANCE_INTERVAL)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 서버 시작 시 작업 프로세스와 주기적 정리 작업을 띄우고, 종료 시 정리한다
+    if STORAGE_BACKEND == "local":
+        # 서버가 꺼져 있는 동안 ./uploads 에 직접 넣거나 지운 파일을 목록에 맞춘다 (바뀐 파일만 해시를 다시 계산)
+        await asyncio.to_thread(catalog.import_tree, UPLOAD_ROOT)
+    await summary_jobs.start()
+    await index_jobs.start()
+    await preview_jobs.start()
+    maintenance_task = asyncio.create_task(_run_maintenance_periodically())
+    # 색인 기능이 생기기 전에 올라온(또는 대기열 초과로 색인되지 못한) PDF를 뒤에서 색인한다
+    backfill_task = asyncio.create_task(_backfill_search_index())
+    loop_lag_task = asyncio.create_task(monitor_event_loop_lag())
+    try:
+        yield
+    finally:
+        loop_lag_task.cancel()
+        backfill_task.cancel()
+        maintenance_task.cancel()
+        await summary_jobs.stop()
+        await index_jobs.stop()
+        await preview_jobs.stop()
+        search_index.close()
+        catalog.close()
+        await storage.close()
+
+
 app = FastAPI(
     title="Lecture Sorter Backend",
     description="강의 자료 업로드·조회 및 과제 등록 기능 + ZIP 다운로드 기능을 제공하는 백엔드 API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS 허용 설정 (모든 도메인 허용)
@@ -30,6 +126,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 요청 수·처리 시간·처리 중 요청 수 기록 (/metrics 로 노출)
+app.add_middleware(MetricsMiddleware)
+
 # 업로드한 파일을 저장할 최상위 디렉터리
 UPLOAD_ROOT = "./uploads"
 
@@ -37,18 +136,359 @@ UPLOAD_ROOT = "./uploads"
 if not os.path.exists(UPLOAD_ROOT):
     os.makedirs(UPLOAD_ROOT, exist_ok=True)
 
+# 업로드 자료(원본 파일·요약) 저장소. 모든 엔드포인트와 /files 는 이 저장소를 거쳐 읽고 쓴다.
+# - local: UPLOAD_ROOT 디렉터리 (기본). 파일 I/O는 크기가 제한된 스레드 풀에서 실행한다
+# - s3: S3 호환 버킷 (S3_BUCKET, S3_PREFIX, S3_ENDPOINT_URL). 파일 내용만 버킷에 두고 목록(catalog)·과제 저널·
+#       업로드 세션·검색 색인은 여전히 이 서버의 로컬 파일이므로, 지금은 서버 한 대에서만 쓸 수 있다
+STORAGE_BACKEND = os.environ.get("STORAGE_BACKEND", "local")
+STORAGE_THREADS = int(os.environ.get("STORAGE_THREADS", "8"))      # 동시 파일 I/O(S3는 연결) 수
+storage = create_storage(STORAGE_BACKEND, UPLOAD_ROOT, max_workers=STORAGE_THREADS)
+
+# 업로드 내용을 해시(SHA-256) 기준으로 한 번만 저장하는 저장소. 요약·미리보기 작업 프로세스는 여기 blob을 읽는다.
+# 로컬 저장소라면 UPLOAD_ROOT 아래 파일들은 여기 blob을 가리키는 하드링크이므로 같은 파일시스템에 둔다
+BLOB_ROOT = "./blobs"
+blob_store = BlobStore(BLOB_ROOT)
+
+# 이어받기(청크) 업로드 세션. 세션 정보는 여기에, 받은 데이터는 로컬 UPLOAD_ROOT 의 목적지 week_{n}/ 아래
+# .part 파일에 두었다가 완료되면 blob 저장소를 거쳐 저장소에 올린다
+UPLOAD_SESSION_ROOT = "./upload_sessions"
+UPLOAD_SESSION_TTL = float(os.environ.get("UPLOAD_SESSION_TTL", str(24 * 3600)))     # 방치 세션 만료(초)
+CHUNKED_MAX_SIZE = int(os.environ.get("CHUNKED_MAX_SIZE", str(4 * 1024 ** 3)))    # 파일 하나 최대 크기
+upload_sessions = UploadSessionStore(UPLOAD_SESSION_ROOT, ttl=UPLOAD_SESSION_TTL)
+
+# 과제 저장소 (upload_id별 덧붙이기 전용 저널 + 마감일 색인).
+# 저널은 제자리 덧붙이기가 필요해 저장소 설정과 관계없이 로컬 UPLOAD_ROOT 에 둔다
+assignment_store = AssignmentStore(UPLOAD_ROOT)
+
+# 업로드 파일·과제 메타데이터 목록 (/uploads/{upload_id} 응답에 사용)
+CATALOG_PATH = "./catalog.sqlite3"
+catalog = Catalog(CATALOG_PATH)
+
+# 강의 PDF 전문 검색 색인. 색인 추가는 PDF 작업 프로세스가 하고, 서버는 검색만 한다
+SEARCH_INDEX_PATH = "./search.sqlite3"
+search_index = SearchIndex(SEARCH_INDEX_PATH, catalog_path=CATALOG_PATH)
+
+# 페이지 미리보기 이미지 캐시 (내용 해시·페이지·크기별, LRU)
+PREVIEW_CACHE_ROOT = "./preview_cache"
+preview_cache = PreviewCache(PREVIEW_CACHE_ROOT, PREVIEW_CACHE_BYTES)
+
+# /download 로 만든 ZIP을 보관하는 디렉터리 (/files 로 노출되지 않도록 UPLOAD_ROOT 밖에 둔다)
+ZIP_CACHE_ROOT = "./zip_cache"
+zip_cache = ZipCache(ZIP_CACHE_ROOT)
+
+# 작업 큐 대기열 길이는 /metrics 를 읽을 때마다 계산한다
+registry.gauge(
+    "lecture_job_queue_depth", "작업 대기열에 쌓인 작업 수", ("queue",),
+    collect=lambda: {(queue.name,): queue.queued for queue in (summary_jobs, index_jobs, preview_jobs)},
+)
+registry.gauge(
+    "lecture_summary_pending", "같은 PDF를 기다리는 요약 작업 수 (내용 해시 기준)",
+    collect=lambda: {(): len(_pending_summaries)},
+)
+registry.gauge(
+    "lecture_preview_cache_bytes", "미리보기 캐시 크기 (바이트)",
+    collect=lambda: {(): preview_cache.total_bytes},
+)
+
 # -----------------------------------
-# 1-1) 정적 파일(업로드된 PDF/요약 TXT 등)을 제공할 엔드포인트를 /files 로 마운트
+# 1-1) /files 엔드포인트: 업로드된 파일(PDF/요약 TXT 등)을 저장소에서 내려줌
 # -----------------------------------
 # 예: GET /files/{upload_id}/{subject}/week_{n}/lecture.pdf
-app.mount("/files", StaticFiles(directory=UPLOAD_ROOT), name="files")
+@app.api_route("/files/{key:path}", methods=["GET", "HEAD"])
+async def get_file(
+    key: str,
+    request: Request,
+    range_header: Optional[str] = Header(None, alias="Range"),
+    if_range: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None)
+):
+    """
+    저장소의 파일을 버퍼링 없이 스트리밍으로 내려줍니다.
+    Range(bytes=시작-끝, 한 구간)를 주면 그 부분만 206으로 보내므로 PDF 뷰어가 필요한 페이지만 받아 갈 수 있고,
+    S3 저장소에서는 구간을 그대로 GetObject에 넘깁니다.
+    """
+    try:
+        check_key(key)
+    except InvalidKey:
+        raise HTTPException(status_code=404, detail="해당 파일을 찾을 수 없습니다.")
+    # 이어받기 중인 .part, 저장소가 쓰는 중인 임시 파일은 내려주지 않는다
+    if is_temp_name(key.rsplit("/", 1)[-1]):
+        raise HTTPException(status_code=404, detail="해당 파일을 찾을 수 없습니다.")
+    info = await storage.stat(key)
+    if info is None:
+        raise HTTPException(status_code=404, detail="해당 파일을 찾을 수 없습니다.")
+
+    media_type = mimetypes.guess_type(key)[0] or "application/octet-stream"
+    if media_type.startswith("text/"):
+        media_type += "; charset=utf-8"
+    headers = {
+        "Accept-Ranges": "bytes",
+        "ETag": info.etag,
+        "Last-Modified": formatdate(info.mtime, usegmt=True),
+    }
+    if if_none_match is not None and _etag_matches(if_none_match, info.etag):
+        return Response(status_code=304, headers=headers)
+
+    start, end, status_code = 0, None, 200
+    # If-Range가 현재 ETag와 다르면(그 사이 파일이 바뀌었으면) 구간 대신 전체를 보낸다
+    if range_header is not None and (if_range is None or if_range.strip() == info.etag):
+        try:
+            byte_range = parse_range(range_header, info.size)
+        except RangeNotSatisfiable:
+            raise HTTPException(
+                status_code=416,
+                detail="요청한 구간이 파일 크기를 벗어났습니다.",
+                headers={"Content-Range": f"bytes */{info.size}"},
+            )
+        if byte_range is not None:
+            start, end = byte_range
+            status_code = 206
+            headers["Content-Range"] = f"bytes {start}-{end}/{info.size}"
+    headers["Content-Length"] = str((info.size - 1 if end is None else end) - start + 1)
+
+    if request.method == "HEAD":
+        return Response(status_code=status_code, headers=headers, media_type=media_type)
+    return StreamingResponse(
+        _count_sent(storage.get_range(key, start, end), "files"),
+        status_code=status_code, headers=headers, media_type=media_type,
+    )
+
+
+async def _count_sent(chunks, source: str):
+    async for chunk in chunks:
+        bytes_sent.inc(len(chunk), source=source)
+        yield chunk
+
+
+def _file_key(upload_id: str, subject: str, week: str, filename: str) -> str:
+    """업로드 파일의 저장소 키: {upload_id}/{subject}/week_{week}/{filename}"""
+    return _storage_key(upload_id, subject, f"week_{week}", filename)
+
+
+def _storage_key(*parts: str) -> str:
+    """각 부분이 경로 한 단계(디렉터리/파일 이름)로만 쓰이는지 확인하고 '/'로 이어 붙인다."""
+    try:
+        if any("/" in part for part in parts):
+            raise InvalidKey("/".join(parts))
+        return check_key("/".join(parts))
+    except InvalidKey:
+        raise HTTPException(status_code=400, detail="upload_id, subject, week, 파일명에는 '/' 나 '..' 를 쓸 수 없습니다.")
 
 
 # -----------------------------------
-# 2) /upload 엔드포인트: 파일 업로드 + 요약 생성
+# 2) /upload 엔드포인트: 파일 업로드 + 요약 작업 등록
 # -----------------------------------
+# 해시별로 진행 중인 요약 작업과, 끝나면 요약을 연결할 (요약 경로, 목록 키) 목록.
+# 같은 PDF가 동시에 여러 번 올라와도 파싱은 한 번만 한다
+_pending_summaries = {}
+
+
+def _on_summary_finished(digest: str):
+    """
+    요약 작업이 끝나면 기다리던 업로드 경로마다 요약을 연결하고, 그 upload_id의 ZIP 캐시를 버린다.
+    실패(파싱 오류, 시간 초과, 프로세스 비정상 종료)하면 캐시하지 않고
+    기존처럼 각 요약 파일에 실패 사유만 남긴다.
+    """
+    async def callback(job):
+        if job.status == JOB_DONE:
+            # 작업 프로세스가 잰 단계별 시간 (앞쪽 페이지 파싱, 요약 기록)
+            for name, seconds in job.result["timings"].items():
+                stage_duration.observe(seconds, stage=name)
+        _, targets = _pending_summaries.pop(digest, (None, []))
+        for summary_key, key in targets:
+            if job.status == JOB_DONE:
+                await storage.put_file(summary_key, blob_store.summary_path(digest))
+            else:
+                await storage.put_bytes(summary_key, f"[PDF 파싱 실패] {job.error}".encode("utf-8"))
+            catalog.set_summary_status(*key, job.status)
+            # 작업이 끝나기 전에 만들어 둔 ZIP에는 이 요약이 없으므로 버린다 (만드는 중인 ZIP도 캐시되지 않는다)
+            zip_cache.invalidate(key[0])
+    return callback
+
+
+async def _request_summary(digest: str, summary_key: str, key: tuple):
+    """
+    digest 내용의 요약을 요청하고, 새로 필요한 작업(없으면 None)을 돌려준다.
+    - key: 끝났을 때 요약 상태를 갱신할 목록 키 (upload_id, subject, week, filename)
+    - 요약이 캐시돼 있으면 파싱 없이 요약만 바로 연결
+    - 같은 내용의 작업이 진행 중이면 그 작업에 합류
+    """
+    if blob_store.has_summary(digest):
+        cache_events.inc(cache="summary", result="hit")
+        await storage.put_file(summary_key, blob_store.summary_path(digest))
+        return None
+
+    pending = _pending_summaries.get(digest)
+    if pending is not None:
+        cache_events.inc(cache="summary", result="coalesced")
+        pending[1].append((summary_key, key))
+        return pending[0]
+
+    cache_events.inc(cache="summary", result="miss")
+
+    job = summary_jobs.submit(
+        process_pdf, blob_store.blob_path(digest), blob_store.summary_path(digest),
+        callback=_on_summary_finished(digest),
+    )
+    _pending_summaries[digest] = (job, [(summary_key, key)])
+    return job
+
+
+# 해시별로 진행 중인 색인 작업. 요약과 같은 방식으로 같은 내용은 한 번만 색인한다
+_pending_indexes = {}
+
+
+def _on_index_finished(digest: str):
+    """색인 작업이 끝나면 단계별 시간을 남기고, 실패했다면 그 사유를 색인 상태로 기록한다 (요약에는 영향 없음)."""
+    def callback(job):
+        _pending_indexes.pop(digest, None)
+        if job.status == JOB_DONE:
+            for name, seconds in job.result["timings"].items():
+                stage_duration.observe(seconds, stage=name)
+        else:
+            logger.warning("검색 색인 실패 (%s): %s", digest, job.error)
+            search_index.record_failure(digest, job.error)
+    return callback
+
+
+async def _request_index(digest: str, file_key: str):
+    """
+    digest 내용의 전체 페이지 검색 색인을 요청하고, 새로 필요한 작업(없으면 None)을 돌려준다.
+    이미 색인됐거나, 색인이 실패로 기록돼 있거나, 진행 중이면 새로 만들지 않는다.
+    대기열이 가득 차면 JobQueueFull을 그대로 올려보낸다.
+    """
+    pending = _pending_indexes.get(digest)
+    if pending is not None:
+        return pending
+    status = await asyncio.to_thread(search_index.status, digest)
+    if status is not None:
+        return None
+
+    source_path = await _ensure_local_blob(digest, file_key)
+    # 받아 오는 동안 같은 내용의 색인 작업이 먼저 등록됐을 수 있다
+    pending = _pending_indexes.get(digest)
+    if pending is not None:
+        return pending
+    job = index_jobs.submit(
+        index_pdf, source_path, SEARCH_INDEX_PATH, digest,
+        callback=_on_index_finished(digest),
+    )
+    _pending_indexes[digest] = job
+    return job
+
+
+# 뒤늦은 색인(backfill)이 대기열을 채워 새 업로드의 색인을 밀어내지 않도록 남겨 둘 자리
+INDEX_BACKFILL_HEADROOM = INDEX_QUEUE_SIZE // 2
+
+
+async def _backfill_search_index() -> int:
+    """
+    catalog에 있지만 색인되지 않은 PDF를 색인 큐에 넣고, 넣은 작업 수를 돌려준다.
+    서버 시작 시 한 번 실행되며, 대기열이 절반 이상 차 있으면 빌 때까지 기다렸다가 넣는다.
+    """
+    count = 0
+    for digest, upload_id, subject, week, filename in await asyncio.to_thread(search_index.unindexed):
+        while index_jobs.queued >= INDEX_QUEUE_SIZE - INDEX_BACKFILL_HEADROOM:
+            await asyncio.sleep(1)
+        try:
+            job = await _request_index(digest, _file_key(upload_id, subject, week, filename))
+        except HTTPException:
+            # 예전 디렉터리에서 가져온, 저장소 키로 쓸 수 없는 이름
+            continue
+        except (OSError, JobQueueFull) as e:
+            logger.warning("검색 색인 채우기 건너뜀 (%s): %s", digest, e)
+            continue
+        if job is not None:
+            count += 1
+    if count:
+        logger.info("색인되지 않은 PDF %d개를 색인 큐에 넣었습니다.", count)
+    return count
+
+
+async def _register_stored_file(upload_id: str, subject: str, week: str,
+                                filename: str, digest: str, size: int) -> dict:
+    """
+    blob 저장소에 저장된 파일을 저장소의 업로드 경로에 올리고 요약을 요청한 뒤, 응답용 결과 항목을 돌려준다.
+    (/upload 와 이어받기 업로드 완료가 함께 사용)
+    """
+    file_key = _file_key(upload_id, subject, week, filename)
+    await storage.put_file(file_key, blob_store.blob_path(digest))
+
+    summary_filename = summary_filename_for(filename)
+    summary_key = _file_key(upload_id, subject, week, summary_filename)
+
+    # 응답용 결과 항목
+    result = {
+        "original_name": filename,
+        "subject": subject,
+        "week": week,
+        # 실제 파일 접근 URL은 /files 라는 prefix를 통해 내려받는다
+        "file_url": f"/files/{file_key}",
+        "summary_url": f"/files/{summary_key}",
+        "sha256": digest,
+        "size": size,
+    }
+
+    if filename.lower().endswith(".pdf"):
+        # PDF라면 첫 3페이지를 요약한다 (같은 내용의 요약이 이미 있으면 재사용)
+        try:
+            job = await _request_summary(digest, summary_key, (upload_id, subject, week, filename))
+        except JobQueueFull:
+            # 사전 확인 이후 대기열이 찼다면 요약 없이 저장만 해 둔다
+            await storage.put_bytes(summary_key, "[요약 대기열 초과] 요약을 만들지 못했습니다.".encode("utf-8"))
+            result["summary_status"] = JOB_FAILED
+        else:
+            if job is None:
+                result["summary_status"] = JOB_DONE
+            else:
+                result["summary_status"] = job.status
+                result["job_id"] = job.job_id
+                result["job_url"] = f"/jobs/{job.job_id}"
+        # 전체 페이지 검색 색인은 별도 작업으로 요청한다. 색인이 실패하거나 밀려도 요약과 업로드는 성공한다
+        try:
+            index_job = await _request_index(digest, file_key)
+        except JobQueueFull:
+            # 색인되지 않은 채로 남겨 두면 다음 서버 시작 때 채워 넣는다
+            logger.warning("색인 대기열 초과로 색인을 미룹니다: %s", file_key)
+        else:
+            if index_job is not None:
+                result["index_job_id"] = index_job.job_id
+                result["index_job_url"] = f"/jobs/{index_job.job_id}"
+    else:
+        # PDF가 아니면 요약할 내용이 없다
+        await storage.put_bytes(summary_key, EMPTY_SUMMARY.encode("utf-8"))
+        result["summary_status"] = JOB_DONE
+
+    return result
+
+
+async def _catalog_entry(result: dict) -> dict:
+    entry = {
+        "filename": result["original_name"],
+        "size": result["size"],
+        "sha256": result["sha256"],
+        "summary_status": result["summary_status"],
+    }
+    # 저장된 파일의 수정 시각을 함께 기록해, 서버 시작 시 목록 맞추기(import_tree)가 바뀌지 않은 파일을 다시 해시하지 않게 한다
+    info = await storage.stat(result["file_url"][len("/files/"):])
+    if info is not None:
+        entry["mtime"] = info.mtime
+    return entry
+
+
+def _check_summary_capacity(pdf_count: int) -> None:
+    # 대기열이 가득 찼다면 파일을 저장하기 전에 거절한다 (백프레셔)
+    if pdf_count and not summary_jobs.has_capacity(pdf_count):
+        raise HTTPException(
+            status_code=503,
+            detail="요약 작업이 밀려 있습니다. 잠시 후 다시 시도해주세요.",
+            headers={"Retry-After": "5"},
+        )
+
+
 @app.post("/upload")
 async def upload_files(
+    request: Request,
     upload_id: str = Form(...),
     subject: str = Form(...),
     week: str = Form(...),
@@ -59,7 +499,13 @@ async def upload_files(
     - subject: 과목명 (예: "디지털공학")
     - week: 주차 (예: "1", "2" 등)
     - files: 실제 업로드된 파일 리스트
+
+    파일은 바로 저장하고 응답합니다. PDF 요약은 작업 큐에서 따로 만들어지며,
+    진행 상태는 각 결과 항목의 job_url(/jobs/{job_id})로 확인할 수 있습니다.
     """
+    # 핸들러가 불리기 전까지 걸린 시간 = multipart 본문을 받아 임시 파일에 스풀한 시간
+    stage_duration.observe(time.perf_counter() - request.state.metrics_start, stage="upload.spool")
+
     upload_id = upload_id.strip()
     subject = subject.strip()
     week = week.strip()
@@ -68,55 +514,174 @@ async def upload_files(
     if not upload_id or not subject or not week or len(files) == 0:
         raise HTTPException(status_code=400, detail="upload_id, subject, week, files 모두 필요합니다.")
 
+    # 저장소 키로 쓸 수 있는 이름인지 먼저 확인한다
+    for file in files:
+        _file_key(upload_id, subject, week, file.filename)
+    _check_summary_capacity(sum(1 for file in files if file.filename.lower().endswith(".pdf")))
+
     results = []
-    # 업로드 경로: ./uploads/{upload_id}/{subject}/week_{week}/
-    base_path = os.path.join(UPLOAD_ROOT, upload_id, subject, f"week_{week}")
-    os.makedirs(base_path, exist_ok=True)
+    # 업로드 경로(저장소 키): {upload_id}/{subject}/week_{week}/{filename}
+    # 내용이 바뀌므로 미리 만들어 둔 ZIP은 버린다
+    zip_cache.invalidate(upload_id)
 
     for file in files:
-        filename = file.filename
-        extracted_text = ""
-
-        # PDF라면 첫 3페이지만 간단히 추출해서 '요약'으로 저장
-        if filename.lower().endswith(".pdf"):
-            try:
-                with pdfplumber.open(file.file) as pdf:
-                    for page in pdf.pages[:3]:
-                        page_text = page.extract_text() or ""
-                        extracted_text += page_text + "\n"
-            except Exception as e:
-                extracted_text = f"[PDF 파싱 실패] {e}"
-
-        # 간단히 텍스트 정리
-        extracted_text = extracted_text.strip().replace("\r\n", "\n")
-        if len(extracted_text) > 500:
-            extracted_text = extracted_text[:500] + "..."
-
-        # 실제 파일 저장
-        file_path = os.path.join(base_path, filename)
-        file.file.seek(0)
-        with open(file_path, "wb") as out_f:
-            shutil.copyfileobj(file.file, out_f)
-
-        # 요약 텍스트를 별도 .txt 파일로 저장
-        summary_filename = f"{os.path.splitext(filename)[0]}_summary.txt"
-        summary_path = os.path.join(base_path, summary_filename)
-        with open(summary_path, "w", encoding="utf-8") as txt_f:
-            txt_f.write(extracted_text or "내용 없음")
-
-        # 응답용 결과 항목에 추가
-        results.append({
-            "original_name": filename,
-            "subject": subject,
-            "week": week,
-            # 실제 파일 접근 URL은 /files 라는 prefix를 통해 내려받는다
-            "file_url": f"/files/{upload_id}/{subject}/week_{week}/{filename}",
-            "summary_url": f"/files/{upload_id}/{subject}/week_{week}/{summary_filename}",
-        })
+        # 실제 파일 저장: 해시를 계산하며 blob 저장소에 한 번만 쓰고(스레드에서), 저장소의 업로드 경로에 올린다
+        # (로컬 저장소는 하드링크만 만든다)
+        with stage("upload.store"):
+            digest, size = await asyncio.to_thread(blob_store.put_stream, file.file)
+        with stage("upload.register"):
+            results.append(await _register_stored_file(upload_id, subject, week, file.filename, digest, size))
+
+    # 이번 요청으로 저장된 파일들을 한 트랜잭션으로 목록에 반영
+    with stage("upload.catalog"):
+        entries = [await _catalog_entry(result) for result in results]
+        catalog.record_files(upload_id, subject, week, entries)
 
     return {"upload_id": upload_id, "results": results}
 
 
+# -----------------------------------
+# 2-1) /jobs/{job_id} 엔드포인트: 요약 작업 상태 조회
+# -----------------------------------
+@app.get("/jobs/{job_id}")
+async def get_job_status(job_id: str):
+    """
+    요약·검색 색인 작업 상태를 반환합니다.
+    - status: queued / running / done / failed
+    - error: 실패한 경우 그 사유 (파싱 오류, 시간 초과 등)
+    """
+    job_id = job_id.strip()
+    job = summary_jobs.get(job_id) or index_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="해당 작업을 찾을 수 없습니다.")
+    return job.to_dict()
+
+
+# -----------------------------------
+# 2-2) /upload/sessions 엔드포인트: 큰 파일용 이어받기(청크) 업로드
+# -----------------------------------
+# 1. POST /upload/sessions                          세션 생성 → session_id, chunk_size, total_chunks
+# 2. PUT  /upload/sessions/{session_id}/chunks/{n}   n번째 청크 전송 (병렬 가능, X-Chunk-SHA256 헤더 필수)
+# 3. GET  /upload/sessions/{session_id}              받은/빠진 청크 확인 (끊겼다면 빠진 것만 다시 전송)
+# 4. POST /upload/sessions/{session_id}/complete     완료 → /upload 와 같은 결과 항목
+def _get_session(session_id: str):
+    session = upload_sessions.get(session_id.strip())
+    if session is None:
+        raise HTTPException(status_code=404, detail="해당 업로드 세션을 찾을 수 없습니다. (만료되었을 수 있습니다)")
+    return session
+
+
+@app.post("/upload/sessions")
+async def create_upload_session(
+    upload_id: str = Form(...),
+    subject: str = Form(...),
+    week: str = Form(...),
+    filename: str = Form(...),
+    size: int = Form(...),
+    chunk_size: int = Form(DEFAULT_CHUNK_SIZE)
+):
+    """
+    - upload_id, subject, week: /upload 와 같음
+    - filename: 저장할 파일명
+    - size: 전체 파일 크기 (바이트)
+    - chunk_size: 청크 크기 (기본 8MB, 256KB ~ 64MB)
+    """
+    upload_id = upload_id.strip()
+    subject = subject.strip()
+    week = week.strip()
+    filename = filename.strip()
+
+    if not upload_id or not subject or not week or not filename:
+        raise HTTPException(status_code=400, detail="upload_id, subject, week, filename 모두 필요합니다.")
+    if not 0 < size <= CHUNKED_MAX_SIZE:
+        raise HTTPException(status_code=400, detail=f"size는 1 ~ {CHUNKED_MAX_SIZE} 바이트여야 합니다.")
+    if not MIN_CHUNK_SIZE <= chunk_size <= MAX_CHUNK_SIZE:
+        raise HTTPException(status_code=400, detail=f"chunk_size는 {MIN_CHUNK_SIZE} ~ {MAX_CHUNK_SIZE} 바이트여야 합니다.")
+    _file_key(upload_id, subject, week, filename)
+
+    base_path = os.path.join(UPLOAD_ROOT, upload_id, subject, f"week_{week}")
+    session = await asyncio.to_thread(
+        upload_sessions.create, upload_id, subject, week, filename, size, chunk_size, base_path
+    )
+    return upload_sessions.status(session)
+
+
+@app.get("/upload/sessions/{session_id}")
+async def get_upload_session(session_id: str):
+    """세션 상태: 받은 청크(received)와 아직 받지 못한 청크(missing) 목록."""
+    return upload_sessions.status(_get_session(session_id))
+
+
+@app.put("/upload/sessions/{session_id}/chunks/{index}")
+async def put_upload_chunk(
+    session_id: str,
+    index: int,
+    request: Request,
+    x_chunk_sha256: Optional[str] = Header(None)
+):
+    """
+    요청 본문 그대로를 index번째 청크로 받습니다 (multipart 아님).
+    본문은 임시 파일 없이 목적지 .part 파일의 해당 위치에 바로 기록되고,
+    X-Chunk-SHA256 헤더(청크의 SHA-256 hex)와 비교해 맞을 때만 받은 것으로 표시합니다.
+    """
+    session = _get_session(session_id)
+    if not x_chunk_sha256:
+        raise HTTPException(status_code=400, detail="X-Chunk-SHA256 헤더가 필요합니다.")
+    try:
+        with stage("chunked.write"):
+            await upload_sessions.write_chunk(session, index, request.stream(), x_chunk_sha256)
+    except ChunkError as e:
+        raise HTTPException(status_code=409 if session.finalizing else 400, detail=str(e))
+    return {"session_id": session.session_id, "index": index, "received": len(session.received),
+            "total_chunks": session.total_chunks}
+
+
+@app.post("/upload/sessions/{session_id}/complete")
+async def complete_upload_session(session_id: str, sha256: Optional[str] = Form(None)):
+    """
+    모든 청크를 받았으면 파일을 완성해 /upload 와 같은 방식으로 등록합니다.
+    - sha256: (선택) 전체 파일의 SHA-256. 주면 완성된 파일과 비교한다
+    """
+    session = _get_session(session_id)
+    if session.finalizing or session.writers:
+        raise HTTPException(status_code=409, detail="청크를 받는 중이거나 이미 완료 처리 중입니다.")
+    missing = session.missing()
+    if missing:
+        raise HTTPException(status_code=409, detail={"message": "아직 받지 못한 청크가 있습니다.", "missing": missing})
+    _check_summary_capacity(1 if session.filename.lower().endswith(".pdf") else 0)
+
+    session.finalizing = True
+    try:
+        # .part 파일을 해시만 계산해 blob으로 옮긴다 (같은 파일시스템이면 다시 쓰지 않는다)
+        with stage("chunked.finalize"):
+            digest, size = await asyncio.to_thread(blob_store.put_file, session.part_path)
+    except Exception:
+        session.finalizing = False
+        raise
+    await asyncio.to_thread(upload_sessions.remove, session, True)
+
+    if sha256 and sha256.strip().lower() != digest:
+        # 연결하지 않은 blob은 주기적 정리에서 지워진다
+        raise HTTPException(status_code=422, detail="전체 파일의 체크섬이 일치하지 않습니다. 다시 업로드해주세요.")
+
+    zip_cache.invalidate(session.upload_id)
+    result = await _register_stored_file(
+        session.upload_id, session.subject, session.week, session.filename, digest, size
+    )
+    catalog.record_files(session.upload_id, session.subject, session.week, [await _catalog_entry(result)])
+    return {"upload_id": session.upload_id, "results": [result]}
+
+
+@app.delete("/upload/sessions/{session_id}")
+async def abort_upload_session(session_id: str):
+    """업로드를 취소하고 받은 데이터를 지웁니다."""
+    session = _get_session(session_id)
+    if session.finalizing or session.writers:
+        raise HTTPException(status_code=409, detail="청크를 받는 중이거나 이미 완료 처리 중입니다.")
+    await asyncio.to_thread(upload_sessions.remove, session)
+    return {"message": "업로드 세션이 취소되었습니다."}
+
+
 # -----------------------------------
 # 3) /assignments 엔드포인트: 과제 등록
 # -----------------------------------
@@ -140,39 +705,48 @@ async def register_assignment(
 
     if not upload_id or not subject or not title or not deadline:
         raise HTTPException(status_code=400, detail="모든 항목(upload_id, subject, title, deadline)이 필요합니다.")
+    # upload_id는 ./uploads 아래 디렉터리 이름이 된다
+    _storage_key(upload_id)
 
-    # 과제 저장 경로: ./uploads/{upload_id}/assignments.json
-    assignment_dir = os.path.join(UPLOAD_ROOT, upload_id)
-    os.makedirs(assignment_dir, exist_ok=True)
+    # 과제 저장: ./uploads/{upload_id}/assignments.jsonl 에 한 줄 덧붙이기 (파일 전체를 다시 쓰지 않는다).
+    # 저널이 유일한 원본이고, 목록(catalog)은 ETag가 바뀌도록 version만 올린다
+    with stage("assignments.append"):
+        await asyncio.to_thread(assignment_store.add, upload_id, subject, title, deadline)
+    catalog.touch(upload_id)
+    zip_cache.invalidate(upload_id)
 
-    assignment_path = os.path.join(assignment_dir, "assignments.json")
-    if os.path.exists(assignment_path):
-        try:
-            with open(assignment_path, "r", encoding="utf-8") as f:
-                existing_data = json.load(f)
-        except json.JSONDecodeError:
-            existing_data = []
-    else:
-        existing_data = []
+    return {"message": "과제가 정상적으로 등록되었습니다."}
 
-    new_assignment = {
-        "subject": subject,
-        "title": title,
-        "deadline": deadline
-    }
-    existing_data.append(new_assignment)
 
-    with open(assignment_path, "w", encoding="utf-8") as f:
-        json.dump(existing_data, f, ensure_ascii=False, indent=2)
+# -----------------------------------
+# 3-1) /assignments/due 엔드포인트: 마감 임박 과제 조회
+# -----------------------------------
+# 조회 기간 상한 (너무 크면 날짜 계산이 넘친다)
+MAX_DUE_DAYS = 3650
+
 
-    return {"message": "과제가 정상적으로 등록되었습니다."}
+@app.get("/assignments/due")
+async def get_due_assignments(days: int = 7, upload_id: Optional[str] = None):
+    """
+    오늘부터 days일 안에 마감되는 과제를 마감일 순으로 반환합니다.
+    - days: 조회 기간 (기본 7일, 최대 3650일)
+    - upload_id: 지정하면 해당 upload_id의 과제만, 생략하면 전체 upload_id에서 조회
+    """
+    if not 0 <= days <= MAX_DUE_DAYS:
+        raise HTTPException(status_code=400, detail=f"days는 0 ~ {MAX_DUE_DAYS} 이어야 합니다.")
+    if upload_id is not None:
+        upload_id = upload_id.strip()
+
+    # 최초 조회 때만 디스크에서 색인을 만들므로 스레드에서 실행
+    assignments = await asyncio.to_thread(assignment_store.due, days, upload_id)
+    return {"days": days, "upload_id": upload_id, "assignments": assignments}
 
 
 # -----------------------------------
 # 4) /uploads/{upload_id} 엔드포인트: 업로드된 자료 조회 (JSON)
 # -----------------------------------
 @app.get("/uploads/{upload_id}")
-async def get_upload_info(upload_id: str):
+async def get_upload_info(upload_id: str, if_none_match: Optional[str] = Header(None)):
     """
     업로드된 자료(폴더 구조)를 JSON 형태로 반환합니다.
     {
@@ -183,52 +757,214 @@ async def get_upload_info(upload_id: str):
       "과목2": { … },
       "assignments": [ {subject, title, deadline}, … ]   # 있을 경우 과제 목록
     }
+    디렉터리를 순회하지 않고 메타데이터 목록(catalog)에서 바로 조회하며,
+    ETag가 If-None-Match 와 같으면(내용이 바뀌지 않았으면) 본문 없이 304를 반환합니다.
     """
     upload_id = upload_id.strip()
-    target_dir = os.path.join(UPLOAD_ROOT, upload_id)
-    if not os.path.exists(target_dir):
+
+    # 1) version만 먼저 확인해 바뀌지 않았다면 목록을 만들지 않는다
+    version = catalog.version(upload_id)
+    if version is None:
         raise HTTPException(status_code=404, detail="해당 upload_id의 자료를 찾을 수 없습니다.")
+    if if_none_match is not None and _etag_matches(if_none_match, catalog.etag(version)):
+        cache_events.inc(cache="uploads_etag", result="hit")
+        return Response(status_code=304, headers={"ETag": catalog.etag(version)})
+    cache_events.inc(cache="uploads_etag", result="miss")
 
-    result = {}
-    # 1) 과목별 week 디렉터리 순회
-    for entry in os.listdir(target_dir):
-        subject_path = os.path.join(target_dir, entry)
-        if not os.path.isdir(subject_path):
-            continue
+    # 2) 목록 조회 (version과 파일 목록은 같은 트랜잭션에서 읽는다).
+    #    과제는 저널에서 읽는다. 저널에 쓴 뒤에 version을 올리므로 먼저 읽은 version이 새 과제를 가리는 일은 없다
+    with stage("uploads.listing"):
+        version, result = catalog.listing(upload_id)
+        assignments = await asyncio.to_thread(assignment_store.list, upload_id)
+    # 기존 응답처럼 과제가 있을 때만 키를 넣는다 (프런트엔드는 키가 있으면 과제 목록 영역을 그린다)
+    if assignments:
+        result["assignments"] = [
+            {"subject": a.get("subject", ""), "title": a.get("title", ""), "deadline": a.get("deadline", "")}
+            for a in assignments
+        ]
+    headers = {"ETag": catalog.etag(version), "Cache-Control": "no-cache"}
+    return JSONResponse(result, headers=headers)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match 헤더(쉼표로 구분된 목록 또는 *)가 etag와 일치하는지 확인합니다."""
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+# -----------------------------------
+# 4-1) /search/{upload_id} 엔드포인트: 강의 자료 전문 검색
+# -----------------------------------
+@app.get("/search/{upload_id}")
+async def search_uploads(upload_id: str, q: str = "", limit: int = 20):
+    """
+    upload_id에 올라온 PDF 본문에서 q를 찾아 관련도 순으로 반환합니다.
+    - q: 검색어 (띄어쓰기로 여러 개를 주면 모두 포함한 페이지만)
+    - limit: 최대 결과 수 (1~100)
+    결과 항목: subject, week, filename, page(1부터), snippet, score, file_url
+    """
+    upload_id = upload_id.strip()
+    q = q.strip()
+    if not q:
+        raise HTTPException(status_code=400, detail="검색어(q)가 필요합니다.")
+    if catalog.version(upload_id) is None:
+        raise HTTPException(status_code=404, detail="해당 upload_id의 자료를 찾을 수 없습니다.")
+    limit = max(1, min(limit, 100))
+
+    with stage("search.query"):
+        hits = await asyncio.to_thread(search_index.search, upload_id, q, limit)
+    for hit in hits:
+        hit["file_url"] = f"/files/{upload_id}/{hit['subject']}/week_{hit['week']}/{hit['filename']}"
+    return {"upload_id": upload_id, "query": q, "hits": hits}
 
-        # "assignments.json" 파일은 따로 처리
-        if entry == "assignments.json":
-            continue
 
-        subject_data = {}
-        for week_folder in os.listdir(subject_path):
-            week_path = os.path.join(subject_path, week_folder)
-            if not os.path.isdir(week_path):
-                continue
-
-            # week_{n} 폴더 안의 파일 목록만 추출 (파일명만)
-            file_list = [
-                fname
-                for fname in os.listdir(week_path)
-                if os.path.isfile(os.path.join(week_path, fname))
-            ]
-            # 키는 “주차”만 남겨둔다 (week_ 를 제거)
-            subject_data[week_folder.replace("week_", "")] = file_list
-
-        if subject_data:
-            result[entry] = subject_data
-
-    # 2) assignments.json 파일이 있다면 과제 목록으로 추가
-    assignment_path = os.path.join(target_dir, "assignments.json")
-    if os.path.exists(assignment_path):
+# -----------------------------------
+# 4-2) /preview/... 엔드포인트: PDF 페이지 미리보기 이미지
+# -----------------------------------
+# 캐시 키별로 진행 중인 렌더링 작업. 같은 이미지를 동시에 요청하면 렌더링은 한 번만 한다
+_pending_previews = {}
+
+
+def _on_preview_finished(key: str):
+    def callback(job):
+        _pending_previews.pop(key, None)
+        # result가 None이면 없는 페이지 (캐시할 이미지가 없다)
+        if job.status == JOB_DONE and job.result is not None:
+            preview_cache.add(key, job.result)
+    return callback
+
+
+@app.get("/preview/{upload_id}/{subject}/{week}/{filename}")
+async def get_preview(
+    upload_id: str,
+    subject: str,
+    week: str,
+    filename: str,
+    page: int = 1,
+    width: int = DEFAULT_WIDTH,
+    v: Optional[str] = None,
+    accept: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None)
+):
+    """
+    PDF의 한 페이지를 이미지(WebP, 지원하지 않는 브라우저는 PNG)로 반환합니다.
+    - week: 주차 ("1" 또는 "week_1")
+    - page: 페이지 번호 (1부터)
+    - width: 이미지 폭(px, 64 ~ 2048)
+    - v: (선택) 파일의 sha256. 현재 파일과 같으면 1년 동안 캐시해도 되는 응답을 준다
+    처음 요청될 때 렌더링해 캐시하고, 이후에는 캐시된 이미지를 그대로 내려줍니다.
+    """
+    upload_id = upload_id.strip()
+    subject = subject.strip()
+    week = week.strip()
+    if week.startswith("week_"):
+        week = week[len("week_"):]
+    if not filename.lower().endswith(".pdf"):
+        raise HTTPException(status_code=415, detail="PDF 파일만 미리볼 수 있습니다.")
+    file_key = _file_key(upload_id, subject, week, filename)
+
+    digest = catalog.file_digest(upload_id, subject, week, filename)
+    if digest is None:
+        raise HTTPException(status_code=404, detail="해당 파일을 찾을 수 없습니다.")
+    page_count = search_index.page_count(digest)
+    if page < 1 or (page_count is not None and page > page_count):
+        raise HTTPException(status_code=404, detail="해당 페이지가 없습니다.")
+
+    width = normalize_width(width)
+    fmt = "webp" if accept and "image/webp" in accept else "png"
+    key = cache_key(digest, page, width, fmt)
+    _, _, media_type = FORMATS[fmt]
+
+    # 같은 키면 이미지 내용도 같으므로 키 자체를 강한 ETag로 쓴다
+    headers = {
+        "ETag": f'"{key}"',
+        "Vary": "Accept",
+        "Cache-Control": (
+            "public, max-age=31536000, immutable" if v and v.strip().lower() == digest
+            else "public, max-age=3600"
+        ),
+    }
+    if if_none_match is not None and _etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+
+    # 미리보기는 작으므로 한 번에 읽어 보낸다 (읽은 뒤에는 캐시에서 지워져도 문제없다)
+    path = preview_cache.get(key)
+    if path is not None:
         try:
-            with open(assignment_path, "r", encoding="utf-8") as f:
-                assignments = json.load(f)
-        except json.JSONDecodeError:
-            assignments = []
-        result["assignments"] = assignments
+            content = await asyncio.to_thread(_read_bytes, path)
+        except FileNotFoundError:
+            # get()과 읽기 사이에 캐시에서 밀려났다면 없었던 것으로 보고 다시 렌더링한다
+            pass
+        else:
+            cache_events.inc(cache="preview", result="hit")
+            return Response(content=content, media_type=media_type, headers=headers)
 
-    return JSONResponse(result)
+    await _render_preview(key, digest, file_key, page, width, fmt)
+    try:
+        content = await asyncio.to_thread(_read_bytes, preview_cache.path_for(key))
+    except FileNotFoundError:
+        # 렌더링하자마자 다른 이미지에 밀려났다 (캐시가 너무 작거나 요청이 몰린 경우)
+        raise HTTPException(
+            status_code=503,
+            detail="미리보기 작업이 밀려 있습니다. 잠시 후 다시 시도해주세요.",
+            headers={"Retry-After": "2"},
+        )
+    return Response(content=content, media_type=media_type, headers=headers)
+
+
+async def _render_preview(key: str, digest: str, file_key: str, page: int, width: int, fmt: str) -> None:
+    """
+    캐시 키의 이미지를 렌더링해 캐시에 넣는다. 같은 키의 작업이 진행 중이면 그 작업을 기다린다.
+    없는 페이지면 404, 렌더링에 실패하면 422, 대기열이 가득 차면 503.
+    """
+    job = _pending_previews.get(key)
+    if job is None:
+        source_path = await _ensure_local_blob(digest, file_key)
+        # 받아 오는 동안 같은 이미지를 요청한 쪽이 먼저 작업을 등록했을 수 있다
+        job = _pending_previews.get(key)
+    if job is not None:
+        cache_events.inc(cache="preview", result="coalesced")
+    else:
+        cache_events.inc(cache="preview", result="miss")
+        try:
+            job = preview_jobs.submit(
+                render_page, source_path, page, width, fmt, preview_cache.path_for(key),
+                callback=_on_preview_finished(key),
+            )
+        except JobQueueFull:
+            raise HTTPException(
+                status_code=503,
+                detail="미리보기 작업이 밀려 있습니다. 잠시 후 다시 시도해주세요.",
+                headers={"Retry-After": "2"},
+            )
+        _pending_previews[key] = job
+    with stage("preview.render"):
+        await job.wait()
+    if job.status != JOB_DONE:
+        raise HTTPException(status_code=422, detail=f"미리보기를 만들지 못했습니다: {job.error}")
+    if job.result is None:
+        # 아직 색인되지 않아 페이지 수를 미리 확인하지 못한 PDF
+        raise HTTPException(status_code=404, detail="해당 페이지가 없습니다.")
+
+
+def _read_bytes(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+async def _ensure_local_blob(digest: str, file_key: str) -> str:
+    """
+    작업 프로세스가 읽을 로컬 blob 경로를 돌려준다. 이 서버에 blob이 없으면
+    (다른 서버가 받은 파일, 목록 가져오기로 등록된 예전 파일) 저장소에서 받아 blob 저장소에 넣는다.
+    """
+    path = blob_store.blob_path(digest)
+    # 있으면 시각을 갱신해 작업 프로세스가 읽기 전에 gc()가 지우지 않게 한다
+    if await asyncio.to_thread(blob_store.touch, digest):
+        return path
+    tmp_path = os.path.join(blob_store.tmp_dir, uuid.uuid4().hex)
+    await storage.get_file(file_key, tmp_path)
+    fetched, _ = await asyncio.to_thread(blob_store.put_file, tmp_path)
+    return blob_store.blob_path(fetched)
 
 
 # -----------------------------------
@@ -237,29 +973,82 @@ async def get_upload_info(upload_id: str):
 @app.get("/download/{upload_id}")
 async def download_zip(upload_id: str):
     """
-    upload_id 디렉터리 전체를 ZIP으로 압축하여 스트리밍 응답으로 내려줍니다.
+    upload_id 디렉터리 전체를 ZIP으로 묶어 스트리밍 응답으로 내려줍니다.
+    ZIP은 디렉터리를 순회하면서 조금씩 만들어 보내므로 메모리 사용량이 파일 크기와 무관하게 일정하고,
+    완성된 ZIP은 디스크에 캐시해 두었다가 내용이 바뀌기 전까지 그대로 재사용합니다.
     """
     upload_id = upload_id.strip()
-    target_dir = os.path.join(UPLOAD_ROOT, upload_id)
-    if not os.path.exists(target_dir):
+    if catalog.version(upload_id) is None:
         raise HTTPException(status_code=404, detail="해당 upload_id의 자료를 찾을 수 없습니다.")
 
-    # 메모리 상에서 ZIP 생성
-    buf = io.BytesIO()
-    with zipfile.ZipFile(buf, mode="w", compression=zipfile.ZIP_DEFLATED) as zf:
-        # target_dir 하위 모든 파일을 순회하며 ZIP에 추가
-        for root, _, files in os.walk(target_dir):
-            for filename in files:
-                file_path = os.path.join(root, filename)
-                # ZIP 안에 들어갈 경로를 상대경로로 계산
-                rel_path = os.path.relpath(file_path, UPLOAD_ROOT)
-                zf.write(file_path, arcname=rel_path)
-    buf.seek(0)
+    # 미리 만들어 둔 ZIP이 있으면 압축 없이 파일 그대로 내려준다
+    cached_path = zip_cache.get(upload_id)
+    if cached_path is not None:
+        cache_events.inc(cache="zip", result="hit")
+        bytes_sent.inc(os.path.getsize(cached_path), source="zip_cache")
+        return FileResponse(cached_path, media_type="application/zip", filename=f"{upload_id}.zip")
+
+    # ZIP 안에 들어갈 경로는 저장소 키 그대로 ({upload_id}/과목/week_n/...)
+    cache_events.inc(cache="zip", result="miss")
+    entries = await _zip_entries(upload_id)
+    chunks = _measure_zip(zip_cache.tee(upload_id, aiter_zip(entries)))
 
     headers = {
         "Content-Disposition": f"attachment; filename={upload_id}.zip"
     }
-    return StreamingResponse(buf, media_type="application/zip", headers=headers)
+    return StreamingResponse(chunks, media_type="application/zip", headers=headers)
+
+
+async def _zip_entries(upload_id: str) -> list:
+    """
+    ZIP에 넣을 (경로, 수정 시각, 크기, 내용) 목록.
+    과제는 저널 파일 대신 현재 목록을 assignments.json 하나로 만들어 넣는다.
+    """
+    assignment_files = {
+        f"{upload_id}/{name}"
+        for name in (SNAPSHOT_FILENAME, f"{SNAPSHOT_FILENAME}.tmp", JOURNAL_FILENAME, COMPACTING_FILENAME)
+    }
+    entries = [
+        (info.key, info.mtime, info.size, storage.get_range(info.key))
+        for info in await storage.list_prefix(f"{upload_id}/")
+        if info.key not in assignment_files
+    ]
+    assignments = await asyncio.to_thread(assignment_store.list, upload_id)
+    if assignments:
+        data = json.dumps(assignments, ensure_ascii=False, indent=2).encode("utf-8")
+        entries.append((f"{upload_id}/{SNAPSHOT_FILENAME}", time.time(), len(data), _single_chunk(data)))
+    return entries
+
+
+async def _single_chunk(data: bytes):
+    yield data
+
+
+async def _measure_zip(chunks):
+    """ZIP을 만들며 보낸 바이트 수와, 처음부터 끝까지(압축 + 전송) 걸린 시간을 기록한다."""
+    start = time.perf_counter()
+    completed = False
+    try:
+        async for chunk in chunks:
+            bytes_sent.inc(len(chunk), source="zip")
+            yield chunk
+        completed = True
+    finally:
+        # 클라이언트가 중간에 끊은 경우는 따로 센다
+        stage_duration.observe(time.perf_counter() - start,
+                               stage="download.zip" if completed else "download.zip_aborted")
+
+
+# -----------------------------------
+# 5-1) /metrics 엔드포인트: Prometheus 형식 지표
+# -----------------------------------
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """
+    요청 수·지연시간 히스토그램, 단계별 소요 시간, 캐시 적중, 작업 대기열 길이,
+    이벤트 루프 지연, 처리 중 요청 수를 Prometheus 텍스트 형식으로 반환합니다.
+    """
+    return Response(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
 
 
 # -----------------------------------
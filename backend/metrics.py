@@ -0,0 +1,246 @@
+# backend/metrics.py
+
+import asyncio
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional, Sequence, Tuple
+
+# 지연시간 히스토그램 기본 구간(초)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra is not None:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> tuple:
+        return tuple(str(labels.get(n, "")) for n in self.label_names)
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+    def _samples(self):
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        super().__init__(name, help_text, labels)
+        self._values: Dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def _samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"
+
+
+class Gauge(_Metric):
+    """
+    현재 값을 나타내는 지표. set/inc/dec 로 직접 바꾸거나,
+    collect 함수를 주면 /metrics 를 읽을 때마다 그 값을 사용한다 (대기열 길이 등).
+    """
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = (), collect=None):
+        super().__init__(name, help_text, labels)
+        self._values: Dict[tuple, float] = {}
+        self._collect = collect
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def _samples(self):
+        if self._collect is not None:
+            # collect()는 {라벨 값 튜플: 값} 을 돌려준다
+            for key, value in sorted(self._collect().items()):
+                self.set(value, **dict(zip(self.label_names, key)))
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._values: Dict[tuple, list] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # [구간별 개수..., 합계, 개수]
+                state = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+                    break
+            state[-2] += value
+            state[-1] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _samples(self):
+        with self._lock:
+            items = sorted((key, list(state)) for key, state in self._values.items())
+        for key, state in items:
+            cumulative = 0
+            for i, bound in enumerate(self.buckets):
+                cumulative += state[i]
+                labels = _format_labels(self.label_names, key, ("le", _format_value(bound)))
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.label_names, key)
+            yield f"{self.name}_sum{labels} {_format_value(state[-2])}"
+            yield f"{self.name}_count{labels} {state[-1]}"
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, help_text: str, labels: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, help_text, labels))
+
+    def gauge(self, name: str, help_text: str, labels: Sequence[str] = (), collect=None) -> Gauge:
+        return self.register(Gauge(name, help_text, labels, collect))
+
+    def histogram(self, name: str, help_text: str, labels: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help_text, labels, buckets))
+
+    def render(self) -> str:
+        """Prometheus 텍스트 형식 (text/plain; version=0.0.4)."""
+        return "\n".join(metric.render() for metric in self._metrics) + "\n"
+
+
+# -----------------------------------
+# 서버 공통 지표
+# -----------------------------------
+registry = Registry()
+
+http_requests = registry.counter(
+    "lecture_http_requests_total", "처리한 HTTP 요청 수", ("method", "route", "status"))
+http_duration = registry.histogram(
+    "lecture_http_request_duration_seconds", "HTTP 요청 처리 시간 (응답 본문 전송 완료까지)", ("method", "route"))
+http_in_flight = registry.gauge(
+    "lecture_http_requests_in_flight", "처리 중인 HTTP 요청 수")
+stage_duration = registry.histogram(
+    "lecture_stage_duration_seconds", "엔드포인트 내부 단계별 소요 시간", ("stage",))
+cache_events = registry.counter(
+    "lecture_cache_events_total", "캐시 적중/실패 수", ("cache", "result"))
+bytes_sent = registry.counter(
+    "lecture_bytes_sent_total", "스트리밍으로 보낸 바이트 수", ("source",))
+loop_lag = registry.histogram(
+    "lecture_event_loop_lag_seconds", "이벤트 루프 지연 (예정 시각 대비 늦게 깨어난 시간)",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5))
+loop_lag_last = registry.gauge(
+    "lecture_event_loop_lag_last_seconds", "가장 최근에 측정한 이벤트 루프 지연")
+
+
+def stage(name: str):
+    """with stage("upload.store"): ... 처럼 단계별 시간을 잰다."""
+    return stage_duration.time(stage=name)
+
+
+async def monitor_event_loop_lag(interval: float = 0.5) -> None:
+    """interval마다 잠들었다 깨어나 늦게 깨어난 만큼을 이벤트 루프 지연으로 기록합니다."""
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        lag = max(0.0, loop.time() - start - interval)
+        loop_lag.observe(lag)
+        loop_lag_last.set(lag)
+
+
+class MetricsMiddleware:
+    """
+    요청 수·처리 시간·처리 중 요청 수를 기록하는 ASGI 미들웨어.
+    라벨에는 실제 경로가 아닌 라우트 패턴(/uploads/{upload_id})을 써서 라벨 종류가 늘어나지 않게 한다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        # 핸들러 안에서 '요청 본문 수신(multipart 스풀)' 시간을 계산할 수 있도록 시작 시각을 남긴다
+        scope.setdefault("state", {})["metrics_start"] = start
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        http_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            http_in_flight.dec()
+            route = scope.get("route")
+            # 마운트된 앱(/files 등)은 라우트 대신 마운트 경로를 쓴다
+            route_path = getattr(route, "path", None) or scope.get("root_path") or "unmatched"
+            method = scope.get("method", "")
+            http_requests.inc(method=method, route=route_path, status=str(status["code"]))
+            http_duration.observe(time.perf_counter() - start, method=method, route=route_path)
@@ -0,0 +1,131 @@
+# backend/preview.py
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+# 미리보기 이미지 폭(px) 범위와 기본값. 캐시 적중률을 높이기 위해 WIDTH_STEP 단위로 맞춘다
+MIN_WIDTH = 64
+MAX_WIDTH = 2048
+DEFAULT_WIDTH = 480
+WIDTH_STEP = 16
+
+# 형식별 (Pillow 형식 이름, 확장자, MIME)
+FORMATS = {
+    "webp": ("WEBP", "webp", "image/webp"),
+    "png": ("PNG", "png", "image/png"),
+}
+
+
+def normalize_width(width: int) -> int:
+    width = max(MIN_WIDTH, min(MAX_WIDTH, width))
+    return -(-width // WIDTH_STEP) * WIDTH_STEP
+
+
+def cache_key(digest: str, page: int, width: int, fmt: str) -> str:
+    """같은 내용(해시)·페이지·크기·형식이면 어느 upload_id의 파일이든 같은 이미지를 쓴다."""
+    return f"{digest}-p{page}-w{width}.{FORMATS[fmt][1]}"
+
+
+def render_page(pdf_path: str, page: int, width: int, fmt: str, out_path: str) -> Optional[int]:
+    """
+    작업 프로세스에서 실행되는 진입점: PDF의 page번째(1부터) 페이지를 width 폭으로 렌더링해
+    out_path에 저장하고 파일 크기를 돌려줍니다.
+    없는 페이지면 렌더링 실패(예외)와 구분할 수 있도록 None을 돌려줍니다.
+    """
+    import pypdfium2 as pdfium
+
+    pdf = pdfium.PdfDocument(pdf_path)
+    try:
+        if not 1 <= page <= len(pdf):
+            return None
+        pdf_page = pdf[page - 1]
+        try:
+            bitmap = pdf_page.render(scale=width / pdf_page.get_width())
+            image = bitmap.to_pil()
+        finally:
+            pdf_page.close()
+    finally:
+        pdf.close()
+
+    pil_format = FORMATS[fmt][0]
+    tmp_path = f"{out_path}.tmp"
+    if pil_format == "WEBP":
+        image.save(tmp_path, format=pil_format, quality=80, method=4)
+    else:
+        image.save(tmp_path, format=pil_format, optimize=True)
+    os.replace(tmp_path, out_path)
+    return os.path.getsize(out_path)
+
+
+class PreviewCache:
+    """
+    렌더링한 미리보기 이미지를 보관하는 디스크 캐시.
+    전체 크기가 max_bytes를 넘으면 가장 오래 쓰이지 않은 이미지부터 지웁니다 (LRU).
+    사용 순서는 메모리에 두고, 서버 시작 시 파일 수정 시각 순으로 다시 만듭니다.
+    """
+
+    def __init__(self, root: str, max_bytes: int):
+        self.root = root
+        self.max_bytes = max_bytes
+        os.makedirs(root, exist_ok=True)
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._total = 0
+
+        entries = []
+        for name in os.listdir(root):
+            path = os.path.join(root, name)
+            if name.endswith(".tmp"):
+                os.remove(path)
+                continue
+            st = os.stat(path)
+            entries.append((st.st_mtime, name, st.st_size))
+        for _, name, size in sorted(entries):
+            self._entries[name] = size
+            self._total += size
+        self._evict()
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.root, key)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total
+
+    def get(self, key: str) -> Optional[str]:
+        """캐시에 있으면 경로를 돌려주고 가장 최근 사용으로 표시합니다."""
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+        path = self.path_for(key)
+        try:
+            # 재시작 후에도 사용 순서가 유지되도록 수정 시각을 갱신
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self._total -= self._entries.pop(key, 0)
+            return None
+        return path
+
+    def add(self, key: str, size: int) -> None:
+        """새로 렌더링한 이미지를 등록하고, 예산을 넘으면 오래된 것부터 지웁니다."""
+        with self._lock:
+            self._total += size - self._entries.pop(key, 0)
+            self._entries[key] = size
+        self._evict()
+
+    def _evict(self) -> None:
+        while True:
+            with self._lock:
+                # 방금 넣은 항목 하나만 남았다면 예산을 넘더라도 지우지 않는다
+                if self._total <= self.max_bytes or len(self._entries) <= 1:
+                    return
+                key, size = self._entries.popitem(last=False)
+                self._total -= size
+            try:
+                os.remove(self.path_for(key))
+            except FileNotFoundError:
+                pass
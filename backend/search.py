@@ -0,0 +1,207 @@
+# backend/search.py
+
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import List, Optional
+
+# 한글(완성형 음절)·한자·가나 연속 구간은 띄어쓰기만으로 단어를 나눌 수 없으므로 2글자(bigram) 단위로 색인하고,
+# 영문·숫자는 소문자 단어 단위로 색인한다
+_CJK_RUN = r"[가-힣぀-ヿ一-鿿]+"
+_WORD_RUN = r"[0-9a-z]+"
+_TOKEN_RE = re.compile(f"({_CJK_RUN})|({_WORD_RUN})")
+
+# 스니펫(검색어 주변 본문) 앞뒤 글자 수
+SNIPPET_RADIUS = 60
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    digest     TEXT PRIMARY KEY,
+    pages      INTEGER NOT NULL,
+    indexed_at REAL NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS pages USING fts5(
+    tokens,
+    digest UNINDEXED,
+    page UNINDEXED,
+    body UNINDEXED
+);
+-- 색인 작업이 실패한 내용 (같은 내용을 계속 다시 시도하지 않도록 기록해 둔다)
+CREATE TABLE IF NOT EXISTS failures (
+    digest    TEXT PRIMARY KEY,
+    error     TEXT NOT NULL,
+    failed_at REAL NOT NULL
+);
+"""
+
+
+def normalize(text: str) -> str:
+    # PDF에서 뽑은 한글은 자모가 분리된(NFD) 경우가 있어 NFKC로 합친다
+    return unicodedata.normalize("NFKC", text).lower()
+
+
+def _cjk_tokens(run: str) -> List[str]:
+    """
+    '디지털공학' → ['디지', '지털', '털공', '공학', '학']
+    마지막 글자를 따로 넣어 두면 한 글자 검색도 접두어 검색으로 찾을 수 있다.
+    """
+    if len(run) == 1:
+        return [run]
+    return [run[i:i + 2] for i in range(len(run) - 1)] + [run[-1]]
+
+
+def tokenize(text: str) -> List[str]:
+    tokens = []
+    for cjk, word in _TOKEN_RE.findall(normalize(text)):
+        tokens.extend(_cjk_tokens(cjk) if cjk else [word])
+    return tokens
+
+
+def build_match_query(query: str) -> Optional[str]:
+    """
+    사용자 검색어를 FTS5 MATCH 식으로 바꿉니다. 띄어쓰기로 나뉜 검색어는 모두 포함(AND)해야 합니다.
+    - 여러 글자 한글 검색어: 연속된 bigram 구(phrase)  → 부분 문자열 일치
+    - 한 글자 한글 검색어: 해당 글자로 시작하는 토큰 (접두어 검색)
+    - 영문·숫자: 단어 일치
+    검색할 토큰이 하나도 없으면 None.
+    """
+    clauses = []
+    for cjk, word in _TOKEN_RE.findall(normalize(query)):
+        if word:
+            clauses.append(f'"{word}"')
+        elif len(cjk) == 1:
+            clauses.append(f'"{cjk}"*')
+        else:
+            bigrams = [cjk[i:i + 2] for i in range(len(cjk) - 1)]
+            clauses.append('"' + " ".join(bigrams) + '"')
+    return " AND ".join(clauses) if clauses else None
+
+
+def make_snippet(body: str, query: str, radius: int = SNIPPET_RADIUS) -> str:
+    """본문에서 검색어가 처음 나오는 부분 앞뒤를 잘라 한 줄로 돌려줍니다."""
+    text = " ".join(unicodedata.normalize("NFKC", body).split())
+    lowered = text.lower()
+    positions = [lowered.find(term) for term in normalize(query).split()]
+    positions = [p for p in positions if p >= 0]
+    pos = min(positions) if positions else 0
+    start = max(0, pos - radius)
+    end = min(len(text), pos + radius)
+    return ("…" if start > 0 else "") + text[start:end] + ("…" if end < len(text) else "")
+
+
+class SearchIndex:
+    """
+    강의 PDF 전문 검색 색인 (SQLite FTS5).
+
+    색인은 파일 내용(SHA-256) 단위로 한 번만 만들고, 페이지마다 한 행을 넣습니다.
+    FTS5는 색인을 디스크의 세그먼트(b-tree)로 나눠 저장하고 문서가 추가될 때마다 조금씩 병합하므로,
+    코퍼스가 커져도 검색 시 필요한 세그먼트 페이지만 읽습니다.
+    어느 upload_id의 어떤 파일인지는 catalog(files.sha256)를 붙여(ATTACH) 조회합니다.
+    색인 추가는 PDF 작업 프로세스에서, 검색은 서버 프로세스에서 하므로 WAL 모드로 엽니다.
+    """
+
+    def __init__(self, path: str, catalog_path: Optional[str] = None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        if catalog_path is not None:
+            self._conn.execute("ATTACH DATABASE ? AS catalog", (catalog_path,))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def has_document(self, digest: str) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM documents WHERE digest = ?", (digest,)).fetchone() is not None
+
+    def page_count(self, digest: str) -> Optional[int]:
+        """색인된 내용이면 페이지 수, 아니면 None."""
+        with self._lock:
+            row = self._conn.execute("SELECT pages FROM documents WHERE digest = ?", (digest,)).fetchone()
+        return None if row is None else row[0]
+
+    def status(self, digest: str) -> Optional[str]:
+        """색인 상태: "done"(색인됨) / "failed"(마지막 색인 작업 실패) / None(아직 없음)."""
+        with self._lock:
+            if self._conn.execute("SELECT 1 FROM documents WHERE digest = ?", (digest,)).fetchone():
+                return "done"
+            if self._conn.execute("SELECT 1 FROM failures WHERE digest = ?", (digest,)).fetchone():
+                return "failed"
+        return None
+
+    def record_failure(self, digest: str, error: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO failures (digest, error, failed_at) VALUES (?, ?, ?)",
+                (digest, error, time.time()),
+            )
+
+    def unindexed(self) -> List[tuple]:
+        """
+        catalog에 PDF로 올라와 있지만 색인되지도, 실패로 기록되지도 않은 내용의 (digest, upload_id, subject, week, filename) 목록.
+        색인 기능이 생기기 전에 올라온 파일을 채워 넣는 데 씁니다. 내용 하나당 업로드 경로 하나만 돌려줍니다.
+        """
+        with self._lock:
+            return self._conn.execute(
+                "SELECT f.sha256, MIN(f.upload_id), f.subject, f.week, f.filename FROM catalog.files AS f "
+                "WHERE f.sha256 IS NOT NULL AND lower(f.filename) LIKE '%.pdf' "
+                "AND f.sha256 NOT IN (SELECT digest FROM documents) "
+                "AND f.sha256 NOT IN (SELECT digest FROM failures) "
+                "GROUP BY f.sha256"
+            ).fetchall()
+
+    def add_document(self, digest: str, pages: List[str]) -> bool:
+        """페이지별 텍스트를 색인에 추가합니다. 이미 색인된 내용이면 아무것도 하지 않고 False."""
+        rows = [(" ".join(tokenize(body)), digest, page_no, body) for page_no, body in enumerate(pages, start=1)]
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                if self._conn.execute("SELECT 1 FROM documents WHERE digest = ?", (digest,)).fetchone():
+                    self._conn.execute("ROLLBACK")
+                    return False
+                self._conn.executemany("INSERT INTO pages (tokens, digest, page, body) VALUES (?, ?, ?, ?)", rows)
+                self._conn.execute(
+                    "INSERT INTO documents (digest, pages, indexed_at) VALUES (?, ?, ?)",
+                    (digest, len(pages), time.time()),
+                )
+                self._conn.execute("DELETE FROM failures WHERE digest = ?", (digest,))
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+        return True
+
+    def search(self, upload_id: str, query: str, limit: int = 20) -> List[dict]:
+        """
+        upload_id의 파일 중 query가 들어간 페이지를 관련도(BM25) 순으로 돌려줍니다.
+        같은 파일이 여러 과목/주차에 올라가 있으면 각각 결과로 나옵니다.
+        """
+        match = build_match_query(query)
+        if match is None:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT f.subject, f.week, f.filename, p.page, p.body, bm25(pages) AS score "
+                "FROM pages AS p JOIN catalog.files AS f ON f.sha256 = p.digest "
+                "WHERE pages MATCH ? AND f.upload_id = ? "
+                "ORDER BY score LIMIT ?",
+                (match, upload_id, limit),
+            ).fetchall()
+        return [
+            {
+                "subject": subject,
+                "week": week,
+                "filename": filename,
+                "page": page,
+                "snippet": make_snippet(body, query),
+                # bm25()는 작을수록 관련도가 높으므로 부호를 바꿔 '클수록 좋은' 점수로 돌려준다
+                "score": -score,
+            }
+            for subject, week, filename, page, body, score in rows
+        ]
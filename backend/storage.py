@@ -0,0 +1,435 @@
+# backend/storage.py
+
+import asyncio
+import os
+import re
+import uuid
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from stat import S_ISREG
+from typing import AsyncIterator, List, Optional, Tuple
+
+from blobstore import link_or_copy
+
+# 읽기/쓰기 단위 (바이트)
+CHUNK_SIZE = 1024 * 1024
+
+# S3 멀티파트 업로드 파트 크기 (S3는 마지막 파트를 빼고 5MB 이상이어야 한다)
+S3_PART_SIZE = 8 * 1024 * 1024
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+# 쓰는 중인 임시 파일 이름 (목록·/files 에서 숨긴다). 사용자가 올린 파일은 '.'으로 시작하거나 .tmp로 끝나도 보인다
+#  - .{파일명}.{uuid}.tmp : LocalStorage 가 쓰는 중인 파일
+#  - .{session_id}.part   : 이어받기(청크) 업로드 중인 파일 (chunked.part_filename)
+_TEMP_NAME_RE = re.compile(r"^\..+\.[0-9a-f]{32}\.tmp$|^\.[0-9a-f]{32}\.part$")
+
+
+class InvalidKey(ValueError):
+    """'..' 등이 들어 있어 저장소 밖을 가리킬 수 있는 키."""
+
+
+class RangeNotSatisfiable(ValueError):
+    """Range 헤더의 구간이 파일 크기를 벗어날 때 발생합니다 (416)."""
+
+
+def check_key(key: str) -> str:
+    """
+    저장소 키는 'upload_id/과목/week_n/파일명' 처럼 '/'로 구분된 상대 경로입니다.
+    빈 구간, '.', '..', 절대 경로는 허용하지 않습니다.
+    """
+    parts = key.split("/")
+    if not key or any(part in ("", ".", "..") or "\\" in part or "\0" in part for part in parts):
+        raise InvalidKey(f"잘못된 저장소 키입니다: {key!r}")
+    return key
+
+
+def is_temp_name(name: str) -> bool:
+    """저장소나 이어받기 업로드가 쓰는 중인 임시 파일의 이름(경로의 마지막 부분)인지 확인합니다."""
+    return _TEMP_NAME_RE.match(name) is not None
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Range 헤더를 (시작, 끝) 바이트(끝 포함)로 바꿉니다. 한 구간만 지원합니다.
+    - "bytes=0-99" / "bytes=100-" / "bytes=-500"(마지막 500바이트)
+    형식이 다르거나 여러 구간이면 None (전체를 200으로 보내면 된다),
+    파일 크기를 벗어나면 RangeNotSatisfiable.
+    """
+    match = _RANGE_RE.match(header.strip())
+    if match is None or match.group(0) == "bytes=-":
+        return None
+    first, last = match.groups()
+    if not first:
+        # 접미사 구간: 마지막 n바이트
+        length = int(last)
+        if length == 0 or size == 0:
+            raise RangeNotSatisfiable(header)
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or (last and int(last) < start):
+        raise RangeNotSatisfiable(header)
+    return start, end
+
+
+class ObjectInfo:
+    """저장소 객체 하나의 메타데이터."""
+
+    def __init__(self, key: str, size: int, mtime: float, etag: str):
+        self.key = key
+        self.size = size
+        self.mtime = mtime
+        self.etag = etag
+
+
+class Storage(ABC):
+    """
+    업로드 자료(./uploads/{upload_id}/… 아래 원본 파일과 요약)를 보관하는 저장소의 공통 인터페이스.
+    모든 메서드는 비동기이며 이벤트 루프를 막지 않습니다. 키는 check_key()를 통과한 상대 경로입니다.
+    """
+
+    @abstractmethod
+    async def put_stream(self, key: str, chunks: AsyncIterator[bytes]) -> int:
+        """chunks를 key로 저장하고 크기를 돌려줍니다. 끝까지 받은 뒤에만 보이게 됩니다."""
+
+    async def put_bytes(self, key: str, data: bytes) -> None:
+        async def chunks():
+            yield data
+        await self.put_stream(key, chunks())
+
+    @abstractmethod
+    async def put_file(self, key: str, src_path: str) -> None:
+        """로컬 파일(blob 등)을 key로 저장합니다. 원본은 그대로 둡니다."""
+
+    @abstractmethod
+    async def get_file(self, key: str, dest_path: str) -> None:
+        """key를 로컬 파일로 받아 옵니다 (작업 프로세스가 읽을 수 있도록)."""
+
+    @abstractmethod
+    async def stat(self, key: str) -> Optional[ObjectInfo]:
+        """없으면 None."""
+
+    @abstractmethod
+    def get_range(self, key: str, start: int = 0, end: Optional[int] = None) -> AsyncIterator[bytes]:
+        """
+        start ~ end(끝 포함, None이면 끝까지) 바이트를 조금씩 읽어 내보내는 비동기 제너레이터.
+        처음 꺼낼 때 열기 때문에 응답을 만들기 전에 미리 만들어 두어도 된다.
+        그 사이 키가 지워졌다면 처음 꺼낼 때 FileNotFoundError가 난다.
+        """
+
+    @abstractmethod
+    async def list_prefix(self, prefix: str) -> List[ObjectInfo]:
+        """prefix로 시작하는 키를 정렬해 돌려줍니다. 쓰는 중인 임시 파일(is_temp_name)은 제외합니다."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """없는 키면 아무것도 하지 않습니다."""
+
+    async def close(self) -> None:
+        pass
+
+
+class LocalStorage(Storage):
+    """
+    로컬 디렉터리 저장소. 파일 I/O는 크기가 제한된 스레드 풀에서 실행해
+    디스크가 느려도 이벤트 루프가 막히지 않고, 동시에 열리는 파일 수도 max_workers로 제한됩니다.
+    put_file()은 가능하면 하드링크를 만들므로 blob 저장소의 참조 수(st_nlink)가 그대로 유지됩니다.
+    """
+
+    def __init__(self, root: str, max_workers: int = 8, chunk_size: int = CHUNK_SIZE):
+        self.root = os.path.abspath(root)
+        self.chunk_size = chunk_size
+        os.makedirs(self.root, exist_ok=True)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="storage")
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.root, *check_key(key).split("/"))
+
+    async def _run(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    def _tmp_path(self, path: str) -> str:
+        # 같은 디렉터리의 숨김 임시 파일에 쓰고 os.replace 로 교체한다 (목록·/files 에는 보이지 않는다)
+        directory, name = os.path.split(path)
+        os.makedirs(directory, exist_ok=True)
+        return os.path.join(directory, f".{name}.{uuid.uuid4().hex}.tmp")
+
+    async def put_stream(self, key: str, chunks: AsyncIterator[bytes]) -> int:
+        path = self.path_for(key)
+        tmp_path = await self._run(self._tmp_path, path)
+        f = await self._run(open, tmp_path, "wb")
+        size = 0
+        try:
+            async for data in chunks:
+                await self._run(f.write, data)
+                size += len(data)
+            await self._run(f.close)
+            await self._run(os.replace, tmp_path, path)
+        except BaseException:
+            await self._run(_discard, f, tmp_path)
+            raise
+        return size
+
+    async def put_bytes(self, key: str, data: bytes) -> None:
+        await self._run(self._write_bytes, self.path_for(key), data)
+
+    def _write_bytes(self, path: str, data: bytes) -> None:
+        tmp_path = self._tmp_path(path)
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    async def put_file(self, key: str, src_path: str) -> None:
+        path = self.path_for(key)
+        await self._run(_makedirs_and_link, src_path, path)
+
+    async def get_file(self, key: str, dest_path: str) -> None:
+        await self._run(_makedirs_and_link, self.path_for(key), dest_path)
+
+    async def stat(self, key: str) -> Optional[ObjectInfo]:
+        try:
+            st = await self._run(os.stat, self.path_for(key))
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        if not S_ISREG(st.st_mode):
+            return None
+        return _object_info(key, st)
+
+    async def get_range(self, key: str, start: int = 0, end: Optional[int] = None) -> AsyncIterator[bytes]:
+        f = await self._run(open, self.path_for(key), "rb")
+        try:
+            if start:
+                await self._run(f.seek, start)
+            remaining = None if end is None else end - start + 1
+            while remaining is None or remaining > 0:
+                size = self.chunk_size if remaining is None else min(self.chunk_size, remaining)
+                data = await self._run(f.read, size)
+                if not data:
+                    break
+                if remaining is not None:
+                    remaining -= len(data)
+                yield data
+        finally:
+            await self._run(f.close)
+
+    async def list_prefix(self, prefix: str) -> List[ObjectInfo]:
+        return await self._run(self._list_prefix, prefix)
+
+    def _list_prefix(self, prefix: str) -> List[ObjectInfo]:
+        # prefix 가 '/'로 끝나면 그 디렉터리 아래만 순회한다
+        directory = prefix.rsplit("/", 1)[0] if "/" in prefix else ""
+        top = self.path_for(directory) if directory else self.root
+        entries = []
+        for root, dirs, files in os.walk(top):
+            dirs.sort()
+            for filename in files:
+                if is_temp_name(filename):
+                    continue
+                path = os.path.join(root, filename)
+                key = os.path.relpath(path, self.root).replace(os.sep, "/")
+                if not key.startswith(prefix):
+                    continue
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    # 순회 중에 지워진 파일은 건너뛴다
+                    continue
+                entries.append(_object_info(key, st))
+        entries.sort(key=lambda info: info.key)
+        return entries
+
+    async def delete(self, key: str) -> None:
+        try:
+            await self._run(os.remove, self.path_for(key))
+        except FileNotFoundError:
+            pass
+
+    async def close(self) -> None:
+        await asyncio.to_thread(self._executor.shutdown)
+
+
+def _object_info(key: str, st) -> ObjectInfo:
+    # 내용이 바뀌면 os.replace 로 새 파일이 되므로 수정 시각·크기로 ETag를 만든다
+    return ObjectInfo(key, st.st_size, st.st_mtime, f'"{st.st_mtime_ns:x}-{st.st_size:x}"')
+
+
+def _makedirs_and_link(src: str, dst: str) -> None:
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    link_or_copy(src, dst)
+
+
+def _discard(f, tmp_path: str) -> None:
+    f.close()
+    try:
+        os.remove(tmp_path)
+    except FileNotFoundError:
+        pass
+
+
+class S3Storage(Storage):
+    """
+    S3 호환 저장소 (AWS S3, MinIO, moto 등). 업로드 자료의 내용만 버킷에 둡니다.
+    목록·과제·업로드 세션·검색 색인은 서버 로컬에 있으므로 아직 여러 서버 인스턴스가 같은 버킷을 나눠 쓸 수는 없습니다.
+
+    boto3 클라이언트 하나를 공유하며, 클라이언트의 연결 풀(max_pool_connections)과
+    요청을 실행하는 스레드 풀 크기를 max_connections로 맞춰 연결을 재사용합니다.
+    자격 증명은 boto3 기본 방식(AWS_ACCESS_KEY_ID 등 환경 변수)을 따르며, 이 저장소를 쓸 때만 boto3가 필요합니다.
+    Range 요청은 GetObject의 Range로 그대로 넘기므로 큰 PDF도 필요한 부분만 받아 보냅니다.
+    """
+
+    def __init__(self, bucket: str, prefix: str = "", endpoint_url: Optional[str] = None,
+                 region: Optional[str] = None, max_connections: int = 16, chunk_size: int = CHUNK_SIZE):
+        # boto3는 S3 저장소를 쓸 때만 필요하다
+        import boto3
+        from botocore.config import Config
+
+        self.bucket = bucket
+        self.prefix = prefix.strip("/") + "/" if prefix.strip("/") else ""
+        self.chunk_size = chunk_size
+        self._client = boto3.client(
+            "s3",
+            endpoint_url=endpoint_url,
+            region_name=region,
+            config=Config(max_pool_connections=max_connections, retries={"max_attempts": 3, "mode": "standard"}),
+        )
+        self._executor = ThreadPoolExecutor(max_workers=max_connections, thread_name_prefix="s3")
+
+    def _object_key(self, key: str) -> str:
+        return self.prefix + check_key(key)
+
+    async def _run(self, func, *args, **kwargs):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, lambda: func(*args, **kwargs))
+
+    @staticmethod
+    def _is_not_found(error) -> bool:
+        return error.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound")
+
+    async def put_stream(self, key: str, chunks: AsyncIterator[bytes]) -> int:
+        """S3_PART_SIZE 보다 작으면 PutObject 한 번, 크면 멀티파트 업로드로 파트 단위로 보냅니다."""
+        object_key = self._object_key(key)
+        buffer = bytearray()
+        size = 0
+        upload_id = None
+        parts = []
+        try:
+            async for data in chunks:
+                buffer += data
+                size += len(data)
+                while len(buffer) >= S3_PART_SIZE:
+                    if upload_id is None:
+                        response = await self._run(
+                            self._client.create_multipart_upload, Bucket=self.bucket, Key=object_key)
+                        upload_id = response["UploadId"]
+                    part, buffer = bytes(buffer[:S3_PART_SIZE]), buffer[S3_PART_SIZE:]
+                    response = await self._run(
+                        self._client.upload_part, Bucket=self.bucket, Key=object_key,
+                        UploadId=upload_id, PartNumber=len(parts) + 1, Body=part,
+                    )
+                    parts.append({"ETag": response["ETag"], "PartNumber": len(parts) + 1})
+
+            if upload_id is None:
+                await self._run(self._client.put_object, Bucket=self.bucket, Key=object_key, Body=bytes(buffer))
+                return size
+            if buffer:
+                response = await self._run(
+                    self._client.upload_part, Bucket=self.bucket, Key=object_key,
+                    UploadId=upload_id, PartNumber=len(parts) + 1, Body=bytes(buffer),
+                )
+                parts.append({"ETag": response["ETag"], "PartNumber": len(parts) + 1})
+            await self._run(
+                self._client.complete_multipart_upload, Bucket=self.bucket, Key=object_key,
+                UploadId=upload_id, MultipartUpload={"Parts": parts},
+            )
+        except BaseException:
+            if upload_id is not None:
+                await self._run(
+                    self._client.abort_multipart_upload, Bucket=self.bucket, Key=object_key, UploadId=upload_id)
+            raise
+        return size
+
+    async def put_bytes(self, key: str, data: bytes) -> None:
+        await self._run(self._client.put_object, Bucket=self.bucket, Key=self._object_key(key), Body=data)
+
+    async def put_file(self, key: str, src_path: str) -> None:
+        # upload_file은 큰 파일을 알아서 멀티파트로 나눠 보낸다
+        await self._run(self._client.upload_file, src_path, self.bucket, self._object_key(key))
+
+    async def get_file(self, key: str, dest_path: str) -> None:
+        await self._run(self._client.download_file, self.bucket, self._object_key(key), dest_path)
+
+    async def stat(self, key: str) -> Optional[ObjectInfo]:
+        from botocore.exceptions import ClientError
+
+        try:
+            response = await self._run(self._client.head_object, Bucket=self.bucket, Key=self._object_key(key))
+        except ClientError as e:
+            if self._is_not_found(e):
+                return None
+            raise
+        return ObjectInfo(key, response["ContentLength"], response["LastModified"].timestamp(), response["ETag"])
+
+    async def get_range(self, key: str, start: int = 0, end: Optional[int] = None) -> AsyncIterator[bytes]:
+        kwargs = {"Bucket": self.bucket, "Key": self._object_key(key)}
+        if start or end is not None:
+            kwargs["Range"] = f"bytes={start}-{'' if end is None else end}"
+        from botocore.exceptions import ClientError
+
+        try:
+            response = await self._run(self._client.get_object, **kwargs)
+        except ClientError as e:
+            # LocalStorage 와 같게 없는 키는 FileNotFoundError 로 알린다
+            if self._is_not_found(e):
+                raise FileNotFoundError(key) from e
+            raise
+        body = response["Body"]
+        try:
+            while True:
+                data = await self._run(body.read, self.chunk_size)
+                if not data:
+                    break
+                yield data
+        finally:
+            await self._run(body.close)
+
+    async def list_prefix(self, prefix: str) -> List[ObjectInfo]:
+        return await self._run(self._list_prefix, prefix)
+
+    def _list_prefix(self, prefix: str) -> List[ObjectInfo]:
+        entries = []
+        paginator = self._client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=self.prefix + prefix):
+            for item in page.get("Contents", []):
+                key = item["Key"][len(self.prefix):]
+                if is_temp_name(key.rsplit("/", 1)[-1]):
+                    continue
+                entries.append(ObjectInfo(key, item["Size"], item["LastModified"].timestamp(), item["ETag"]))
+        entries.sort(key=lambda info: info.key)
+        return entries
+
+    async def delete(self, key: str) -> None:
+        # S3 DeleteObject는 없는 키여도 성공한다
+        await self._run(self._client.delete_object, Bucket=self.bucket, Key=self._object_key(key))
+
+    async def close(self) -> None:
+        await asyncio.to_thread(self._executor.shutdown)
+        self._client.close()
+
+
+def create_storage(backend: str, local_root: str, max_workers: int = 8) -> Storage:
+    """
+    STORAGE_BACKEND 설정값으로 저장소를 만듭니다.
+    - "local": local_root 디렉터리 (기본)
+    - "s3": S3_BUCKET, S3_PREFIX, S3_ENDPOINT_URL(MinIO 등), S3_REGION 환경 변수 사용
+    """
+    if backend == "local":
+        return LocalStorage(local_root, max_workers=max_workers)
+    if backend == "s3":
+        return S3Storage(
+            os.environ["S3_BUCKET"],
+            prefix=os.environ.get("S3_PREFIX", ""),
+            endpoint_url=os.environ.get("S3_ENDPOINT_URL") or None,
+            region=os.environ.get("S3_REGION") or None,
+            max_connections=max_workers,
+        )
+    raise ValueError(f"알 수 없는 STORAGE_BACKEND 입니다: {backend}")
@@ -0,0 +1,102 @@
+# backend/summary.py
+
+import os
+import time
+from typing import Optional
+
+import pdfplumber
+
+from search import SearchIndex
+
+# 요약에 사용할 앞쪽 페이지 수와 최대 글자 수
+SUMMARY_PAGES = 3
+SUMMARY_MAX_CHARS = 500
+
+# 내용이 없을 때 요약 파일에 기록하는 문구
+EMPTY_SUMMARY = "내용 없음"
+
+
+def summary_filename_for(filename: str) -> str:
+    """
+    원본 파일명에 대응하는 요약 파일명을 돌려줍니다. (예: lecture.pdf → lecture_summary.txt)
+    """
+    return f"{os.path.splitext(filename)[0]}_summary.txt"
+
+
+def extract_pages(file_path: str, max_pages: Optional[int] = None) -> list:
+    """
+    PDF 페이지의 텍스트를 페이지 순서대로 뽑습니다. max_pages를 주면 앞쪽 그 페이지까지만 읽습니다.
+    파싱 중 생긴 예외는 그대로 올려보내 호출한 쪽(작업 큐)이 실패로 처리하도록 합니다.
+    """
+    with pdfplumber.open(file_path) as pdf:
+        return [page.extract_text() or "" for page in pdf.pages[:max_pages]]
+
+
+def summarize_pages(pages: list) -> str:
+    """
+    앞쪽 몇 페이지의 텍스트로 간단한 '요약'을 만듭니다.
+    """
+    extracted_text = ""
+    for page_text in pages[:SUMMARY_PAGES]:
+        extracted_text += page_text + "\n"
+
+    # 간단히 텍스트 정리
+    extracted_text = extracted_text.strip().replace("\r\n", "\n")
+    if len(extracted_text) > SUMMARY_MAX_CHARS:
+        extracted_text = extracted_text[:SUMMARY_MAX_CHARS] + "..."
+    return extracted_text
+
+
+def write_summary_text(summary_path: str, text: str) -> None:
+    """
+    요약 텍스트를 .txt 파일로 저장합니다.
+    다른 요청이 쓰다 만 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체합니다.
+    """
+    tmp_path = f"{summary_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as txt_f:
+        txt_f.write(text or EMPTY_SUMMARY)
+    os.replace(tmp_path, summary_path)
+
+
+def process_pdf(file_path: str, summary_path: str) -> dict:
+    """
+    요약 작업 프로세스에서 실행되는 진입점: 앞쪽 SUMMARY_PAGES 페이지만 파싱해 요약 파일을 기록합니다.
+    서버 프로세스가 지표로 남길 수 있도록 단계별 소요 시간(초)을 돌려줍니다.
+    """
+    start = time.perf_counter()
+    pages = extract_pages(file_path, SUMMARY_PAGES)
+    parsed = time.perf_counter()
+    write_summary_text(summary_path, summarize_pages(pages))
+    written = time.perf_counter()
+
+    return {
+        "timings": {
+            "summary.parse": parsed - start,
+            "summary.write": written - parsed,
+        },
+    }
+
+
+def index_pdf(file_path: str, index_path: str, digest: str) -> dict:
+    """
+    색인 작업 프로세스에서 실행되는 진입점: 전체 페이지를 파싱해 검색 색인에 추가합니다.
+    페이지가 많은 PDF도 요약을 늦추지 않도록 요약과 별도의 작업(제한 시간·실패 상태)으로 실행됩니다.
+    """
+    start = time.perf_counter()
+    pages = extract_pages(file_path)
+    parsed = time.perf_counter()
+
+    index = SearchIndex(index_path)
+    try:
+        index.add_document(digest, pages)
+    finally:
+        index.close()
+    indexed = time.perf_counter()
+
+    return {
+        "pages": len(pages),
+        "timings": {
+            "index.parse": parsed - start,
+            "index.write": indexed - parsed,
+        },
+    }
@@ -0,0 +1,7 @@
+# backend/tests/conftest.py
+
+import os
+import sys
+
+# 서버 코드는 backend/ 디렉터리를 기준으로 모듈을 import 한다 (uvicorn main:app 과 같게)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,57 @@
+# backend/tests/test_assignments.py
+
+import datetime
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from assignments import JOURNAL_FILENAME, SNAPSHOT_FILENAME, AssignmentStore
+
+TOTAL = 3000
+THREADS = 64
+
+
+def _add_concurrently(store: AssignmentStore, upload_ids: list) -> None:
+    today = datetime.date.today()
+
+    def add(i: int) -> None:
+        deadline = (today + datetime.timedelta(days=i % 30)).isoformat()
+        store.add(upload_ids[i % len(upload_ids)], "디지털공학", f"과제 {i}", deadline)
+
+    with ThreadPoolExecutor(max_workers=THREADS) as pool:
+        list(pool.map(add, range(TOTAL)))
+
+
+def test_parallel_adds_are_not_lost(tmp_path):
+    # 저널이 작게 잡혀 있어 등록 도중에도 압축(compaction)이 여러 번 일어난다
+    store = AssignmentStore(str(tmp_path), compact_bytes=4 * 1024)
+    _add_concurrently(store, ["nagang"])
+
+    records = store.list("nagang")
+    assert len(records) == TOTAL
+    assert len({r["id"] for r in records}) == TOTAL
+    assert {r["title"] for r in records} == {f"과제 {i}" for i in range(TOTAL)}
+
+    # 압축을 마친 뒤에는 스냅샷 하나에 모두 들어 있어야 한다
+    store.compact_all()
+    assert not os.path.exists(tmp_path / "nagang" / JOURNAL_FILENAME)
+    with open(tmp_path / "nagang" / SNAPSHOT_FILENAME, encoding="utf-8") as f:
+        assert len(json.load(f)) == TOTAL
+
+    # 저장소를 다시 열어도(서버 재시작) 그대로 남아 있고, 마감일 색인도 전부 다시 만들어진다
+    reopened = AssignmentStore(str(tmp_path))
+    assert len(reopened.list("nagang")) == TOTAL
+    assert len(reopened.due(30, "nagang")) == TOTAL
+
+
+def test_parallel_adds_across_upload_ids(tmp_path):
+    upload_ids = [f"user{i}" for i in range(8)]
+    store = AssignmentStore(str(tmp_path), compact_bytes=8 * 1024)
+    _add_concurrently(store, upload_ids)
+
+    # 압축 전(저널 + 스냅샷)에도, 압축 후에도 개수가 같아야 한다
+    assert sum(len(store.list(u)) for u in upload_ids) == TOTAL
+    store.compact_all()
+    reopened = AssignmentStore(str(tmp_path))
+    assert sum(len(reopened.list(u)) for u in upload_ids) == TOTAL
+    assert len(reopened.due(30)) == TOTAL
@@ -0,0 +1,68 @@
+# backend/tests/test_blobstore.py
+
+import io
+import os
+import time
+import types
+
+import blobstore
+from blobstore import BlobStore
+
+GRACE = 3600
+
+
+def _later(monkeypatch, seconds: float) -> None:
+    # ctime은 os.utime 으로 되돌릴 수 없으므로 gc()가 보는 현재 시각을 앞으로 옮긴다
+    now = time.time() + seconds
+    monkeypatch.setattr(blobstore, "time", types.SimpleNamespace(time=lambda: now))
+
+
+def _count_objects(store: BlobStore) -> int:
+    return sum(len(files) for _, _, files in os.walk(store.objects_dir))
+
+
+def test_duplicate_content_is_stored_once(tmp_path):
+    store = BlobStore(str(tmp_path / "blobs"))
+    first = store.put_stream(io.BytesIO(b"same lecture"))
+    second = store.put_stream(io.BytesIO(b"same lecture"))
+    assert first == second
+    assert _count_objects(store) == 1
+    assert os.listdir(store.tmp_dir) == []
+
+    part = tmp_path / "upload.part"
+    part.write_bytes(b"same lecture")
+    assert store.put_file(str(part)) == first
+    assert not part.exists()
+    assert _count_objects(store) == 1
+
+
+def test_gc_removes_only_stale_unlinked_blobs(tmp_path, monkeypatch):
+    store = BlobStore(str(tmp_path / "blobs"))
+    linked, _ = store.put_stream(io.BytesIO(b"linked"))
+    unlinked, _ = store.put_stream(io.BytesIO(b"unlinked"))
+    with open(store.summary_path(unlinked), "w", encoding="utf-8") as f:
+        f.write("요약")
+    # 업로드 경로의 하드링크 = 참조 하나
+    os.link(store.blob_path(linked), tmp_path / "lecture.pdf")
+
+    # 방금 저장된 blob은 아직 연결되지 않았어도 grace_seconds 동안 남겨 둔다
+    assert store.gc(GRACE) == 0
+    assert os.path.exists(store.blob_path(unlinked))
+
+    _later(monkeypatch, GRACE + 1)
+    assert store.gc(GRACE) == 1
+    assert os.path.exists(store.blob_path(linked))
+    assert not os.path.exists(store.blob_path(unlinked))
+    assert not store.has_summary(unlinked)
+
+    # 링크가 끊기면 다음 gc()에서 지워진다
+    os.remove(tmp_path / "lecture.pdf")
+    assert store.gc(GRACE) == 1
+    assert _count_objects(store) == 0
+
+
+def test_touch_reports_missing_blob(tmp_path):
+    store = BlobStore(str(tmp_path / "blobs"))
+    digest, _ = store.put_stream(io.BytesIO(b"lecture"))
+    assert store.touch(digest)
+    assert not store.touch("0" * 64)
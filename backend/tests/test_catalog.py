@@ -0,0 +1,70 @@
+# backend/tests/test_catalog.py
+
+import os
+
+from catalog import Catalog
+
+
+def _write(path, data: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def test_import_tree_reconciles_on_every_start(tmp_path):
+    root = tmp_path / "uploads"
+    week = root / "nagang" / "디지털공학" / "week_1"
+    _write(week / "lecture.pdf", b"%PDF-1")
+    _write(week / "lecture_summary.txt", "요약".encode("utf-8"))
+    (root / "empty").mkdir()
+
+    catalog = Catalog(str(tmp_path / "catalog.sqlite3"))
+    assert catalog.import_tree(str(root)) == 2
+    version, listing = catalog.listing("nagang")
+    assert listing == {"디지털공학": {"1": ["lecture.pdf", "lecture_summary.txt"]}}
+    assert catalog.listing("empty")[1] == {}
+
+    # 바뀐 것이 없으면 version(ETag)도 그대로다
+    assert catalog.import_tree(str(root)) == 0
+    assert catalog.version("nagang") == version
+
+    # 목록이 비어 있지 않아도 새로 생긴 파일·사라진 파일을 반영한다
+    _write(week / "notes.txt", b"memo")
+    _write(root / "nagang" / "디지털공학" / "week_2" / "lab.pdf", b"%PDF-2")
+    os.remove(week / "lecture.pdf")
+    os.remove(week / "lecture_summary.txt")
+    assert catalog.import_tree(str(root)) == 1
+    assert catalog.version("nagang") > version
+    assert catalog.listing("nagang")[1] == {
+        "디지털공학": {"1": ["notes.txt", "notes_summary.txt"], "2": ["lab.pdf", "lab_summary.txt"]},
+    }
+    catalog.close()
+
+
+def test_same_size_replacement_is_rehashed(tmp_path):
+    root = tmp_path / "uploads"
+    path = root / "nagang" / "디지털공학" / "week_1" / "lecture.pdf"
+    _write(path, b"%PDF-1")
+    catalog = Catalog(str(tmp_path / "catalog.sqlite3"))
+    catalog.import_tree(str(root))
+    old_digest = catalog.file_digest("nagang", "디지털공학", "1", "lecture.pdf")
+
+    # 서버가 꺼져 있는 동안 같은 크기의 다른 내용으로 바뀐 파일
+    _write(path, b"%PDF-2")
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert catalog.import_tree(str(root)) == 1
+    new_digest = catalog.file_digest("nagang", "디지털공학", "1", "lecture.pdf")
+    assert new_digest != old_digest
+    assert catalog.import_tree(str(root)) == 0
+    catalog.close()
+
+
+def test_listing_shows_pending_summaries(tmp_path):
+    catalog = Catalog(str(tmp_path / "catalog.sqlite3"))
+    catalog.record_files("nagang", "디지털공학", "1", [
+        {"filename": "lecture.pdf", "size": 1, "sha256": "a" * 64, "summary_status": "queued"},
+    ])
+    # 요약 작업이 끝나기 전에도 기존 응답과 같은 모양으로 요약 파일 이름을 함께 보여준다
+    assert catalog.listing("nagang")[1] == {"디지털공학": {"1": ["lecture.pdf", "lecture_summary.txt"]}}
+    catalog.close()
@@ -0,0 +1,154 @@
+# backend/tests/test_chunked.py
+
+import asyncio
+import hashlib
+import importlib
+import os
+
+import pytest
+
+from chunked import ChunkError, UploadSessionStore
+
+CHUNK = 4
+DATA = b"0123456789"      # 청크 3개: 0123 / 4567 / 89
+
+
+def _sha(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+async def _body(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+def _chunk(index: int) -> bytes:
+    return DATA[index * CHUNK:(index + 1) * CHUNK]
+
+
+def _new_session(tmp_path, ttl=3600):
+    store = UploadSessionStore(str(tmp_path / "sessions"), ttl=ttl)
+    session = store.create("nagang", "디지털공학", "1", "big.pdf", len(DATA), CHUNK, str(tmp_path / "week_1"))
+    return store, session
+
+
+def _put(store, session, index, data, sha=None):
+    asyncio.run(store.write_chunk(session, index, _body(data), sha or _sha(data)))
+
+
+def _part(session) -> bytes:
+    with open(session.part_path, "rb") as f:
+        return f.read()
+
+
+def test_out_of_order_chunks(tmp_path):
+    store, session = _new_session(tmp_path)
+    assert session.missing() == [0, 1, 2]
+    for index in (2, 0, 1):
+        _put(store, session, index, _chunk(index))
+    assert session.missing() == []
+    assert _part(session) == DATA
+
+    # 받은 청크는 세션 파일에도 남아 재시작 후 이어받을 수 있다
+    reopened = UploadSessionStore(str(tmp_path / "sessions"))
+    assert reopened.get(session.session_id).received == {0, 1, 2}
+
+
+def test_checksum_mismatch_is_rejected(tmp_path):
+    store, session = _new_session(tmp_path)
+    with pytest.raises(ChunkError, match="체크섬"):
+        _put(store, session, 1, _chunk(1), sha=_sha(b"other"))
+    assert 1 in session.missing()
+
+
+def test_bad_retry_clears_received_chunk(tmp_path):
+    store, session = _new_session(tmp_path)
+    _put(store, session, 0, _chunk(0))
+    _put(store, session, 1, _chunk(1))
+    with pytest.raises(ChunkError):
+        _put(store, session, 0, b"xxxx", sha=_sha(_chunk(0)))
+    assert session.missing() == [0, 2]
+    assert UploadSessionStore(str(tmp_path / "sessions")).get(session.session_id).received == {1}
+
+    # 다시 보내면 된다
+    _put(store, session, 0, _chunk(0))
+    assert session.missing() == [2]
+
+
+def test_oversized_chunk_does_not_touch_next_chunk(tmp_path):
+    store, session = _new_session(tmp_path)
+    _put(store, session, 1, _chunk(1))
+    with pytest.raises(ChunkError, match="크기"):
+        asyncio.run(store.write_chunk(session, 0, _body(b"0123", b"XXXX"), _sha(b"0123XXXX")))
+    assert _part(session)[4:8] == _chunk(1)
+    assert session.missing() == [0, 2]
+    with pytest.raises(ChunkError, match="청크 번호"):
+        _put(store, session, 3, b"89")
+
+
+def test_expire_removes_idle_sessions(tmp_path):
+    store, session = _new_session(tmp_path, ttl=0)
+    part_path = session.part_path
+
+    # 청크를 쓰는 중인 세션은 지우지 않는다
+    session.writers += 1
+    assert asyncio.run(store.expire()) == 0
+    session.writers -= 1
+
+    assert asyncio.run(store.expire()) == 1
+    assert store.get(session.session_id) is None
+    assert not os.path.exists(part_path)
+    assert os.listdir(tmp_path / "sessions") == []
+    with pytest.raises(ChunkError, match="완료 처리"):
+        _put(store, session, 0, _chunk(0))
+
+
+@pytest.fixture(scope="module")
+def client(tmp_path_factory):
+    # main 은 ./uploads 등 현재 디렉터리 기준 경로를 쓰므로 임시 디렉터리에서 불러온다
+    pytest.importorskip("fastapi")
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp("app"))
+    try:
+        main = importlib.import_module("main")
+        yield TestClient(main.app)
+    finally:
+        os.chdir(cwd)
+
+
+def test_chunk_endpoints(client):
+    size = 600 * 1024
+    chunk_size = 256 * 1024
+    data = os.urandom(size)
+    chunks = [data[i:i + chunk_size] for i in range(0, size, chunk_size)]
+
+    response = client.post("/upload/sessions", data={
+        "upload_id": "nagang", "subject": "디지털공학", "week": "1",
+        "filename": "notes.txt", "size": str(size), "chunk_size": str(chunk_size),
+    })
+    assert response.status_code == 200
+    session_id = response.json()["session_id"]
+    url = f"/upload/sessions/{session_id}"
+
+    # 체크섬이 다르면 400
+    response = client.put(f"{url}/chunks/1", content=chunks[1], headers={"X-Chunk-SHA256": _sha(b"x")})
+    assert response.status_code == 400
+
+    for index in (2, 0):
+        response = client.put(f"{url}/chunks/{index}", content=chunks[index],
+                              headers={"X-Chunk-SHA256": _sha(chunks[index])})
+        assert response.status_code == 200
+
+    # 빠진 청크가 있으면 409
+    response = client.post(f"{url}/complete")
+    assert response.status_code == 409
+    assert response.json()["detail"]["missing"] == [1]
+
+    client.put(f"{url}/chunks/1", content=chunks[1], headers={"X-Chunk-SHA256": _sha(chunks[1])})
+    response = client.post(f"{url}/complete", data={"sha256": _sha(data)})
+    assert response.status_code == 200
+    assert response.json()["results"][0]["sha256"] == _sha(data)
+    assert client.get("/files/nagang/디지털공학/week_1/notes.txt").content == data
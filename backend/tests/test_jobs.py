@@ -0,0 +1,122 @@
+# backend/tests/test_jobs.py
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from jobs import JOB_DONE, JOB_FAILED, JobQueue, JobQueueFull
+
+# 작업 함수는 자식 프로세스로 pickle 되어 넘어가므로 내장 함수를 쓴다 (time.sleep, divmod, int)
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def test_timeout_kills_worker_and_respawns():
+    async def scenario():
+        queue = JobQueue("test", workers=1, timeout=0.5)
+        await queue.start()
+        try:
+            started = time.monotonic()
+            slow = await queue.submit(time.sleep, 30).wait()
+            assert time.monotonic() - started < 10
+            assert slow.status == JOB_FAILED
+            assert "0.5초" in slow.error
+
+            # 시간 초과로 종료된 프로세스 대신 새 프로세스가 다음 작업을 실행한다
+            quick = await queue.submit(divmod, 7, 2).wait()
+            assert quick.status == JOB_DONE
+            assert quick.result == (3, 1)
+        finally:
+            await queue.stop()
+
+    _run(scenario())
+
+
+def test_error_marks_job_failed():
+    async def scenario():
+        queue = JobQueue("test", workers=1, timeout=10)
+        await queue.start()
+        try:
+            job = await queue.submit(int, "x").wait()
+            assert job.status == JOB_FAILED
+            assert "invalid literal" in job.error
+            assert queue.get(job.job_id) is job
+            assert job.to_dict()["status"] == JOB_FAILED
+        finally:
+            await queue.stop()
+
+    _run(scenario())
+
+
+def test_full_queue_rejects_new_jobs():
+    async def scenario():
+        queue = JobQueue("test", workers=1, max_queued=2, timeout=10)
+        assert not queue.has_capacity()
+        await queue.start()
+        try:
+            # 작업자가 꺼내 가기 전(await 전)이라 대기열에 그대로 쌓인다
+            first = queue.submit(time.sleep, 0.2)
+            assert queue.has_capacity(1) and not queue.has_capacity(2)
+            second = queue.submit(time.sleep, 0.2)
+            assert not queue.has_capacity()
+            with pytest.raises(JobQueueFull, match="test"):
+                queue.submit(time.sleep, 0.2)
+
+            await first.wait()
+            await second.wait()
+            assert queue.has_capacity(2)
+        finally:
+            await queue.stop()
+
+    _run(scenario())
+
+
+def test_callback_runs_before_wait_returns():
+    events = []
+
+    def sync_callback(job):
+        events.append(("sync", job.status, job.result))
+
+    async def async_callback(job):
+        await asyncio.sleep(0.1)
+        events.append(("async", job.status, job.result))
+
+    async def scenario():
+        queue = JobQueue("test", workers=2, timeout=10)
+        await queue.start()
+        try:
+            first = queue.submit(divmod, 9, 4, callback=sync_callback)
+            second = queue.submit(divmod, 5, 5, callback=async_callback)
+            await first.wait()
+            assert ("sync", JOB_DONE, (2, 1)) in events
+            # 코루틴 콜백이 끝난 뒤에야 wait()가 돌아온다
+            await second.wait()
+            assert ("async", JOB_DONE, (1, 0)) in events
+        finally:
+            await queue.stop()
+
+    _run(scenario())
+
+
+def test_running_jobs_do_not_block_default_executor():
+    async def scenario():
+        # 공용 풀이 스레드 하나뿐이어도 작업을 기다리는 동안 다른 to_thread 호출이 막히지 않아야 한다
+        asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=1))
+        queue = JobQueue("test", workers=2, timeout=10)
+        await queue.start()
+        try:
+            jobs = [queue.submit(time.sleep, 2), queue.submit(time.sleep, 2)]
+            await asyncio.sleep(0.5)
+            started = time.monotonic()
+            await asyncio.to_thread(lambda: None)
+            assert time.monotonic() - started < 0.5
+            for job in jobs:
+                await job.wait()
+        finally:
+            await queue.stop()
+
+    _run(scenario())
@@ -0,0 +1,63 @@
+# backend/tests/test_preview.py
+
+import os
+import time
+
+from preview import PreviewCache
+
+
+def _render(cache: PreviewCache, key: str, size: int) -> None:
+    # 작업 프로세스가 렌더링한 것처럼 파일을 쓰고 등록한다
+    with open(cache.path_for(key), "wb") as f:
+        f.write(b"x" * size)
+    cache.add(key, size)
+
+
+def test_lru_eviction_under_max_bytes(tmp_path):
+    cache = PreviewCache(str(tmp_path), max_bytes=300)
+    for key in ("a", "b", "c"):
+        _render(cache, key, 100)
+    assert cache.total_bytes == 300
+
+    # a를 최근에 썼으므로 가장 오래 쓰이지 않은 b가 지워진다
+    assert cache.get("a") is not None
+    _render(cache, "d", 100)
+    assert cache.get("b") is None
+    assert not os.path.exists(cache.path_for("b"))
+    assert all(cache.get(key) is not None for key in ("a", "c", "d"))
+    assert cache.total_bytes == 300
+
+    # 예산보다 큰 이미지 하나만 남는 경우에는 그것까지 지우지 않는다
+    _render(cache, "big", 1000)
+    assert sorted(os.listdir(tmp_path)) == ["big"]
+    assert cache.total_bytes == 1000
+
+
+def test_file_removed_outside_cache_is_a_miss(tmp_path):
+    cache = PreviewCache(str(tmp_path), max_bytes=1000)
+    _render(cache, "a", 100)
+    os.remove(cache.path_for("a"))
+    assert cache.get("a") is None
+    assert cache.total_bytes == 0
+
+
+def test_order_is_rebuilt_on_restart(tmp_path):
+    now = time.time()
+    for i, key in enumerate(("old", "middle", "new")):
+        path = tmp_path / key
+        path.write_bytes(b"x" * 100)
+        os.utime(path, (now - 100 + i, now - 100 + i))
+    # 쓰다 만 임시 파일은 시작할 때 지운다
+    (tmp_path / "half.tmp").write_bytes(b"x")
+
+    cache = PreviewCache(str(tmp_path), max_bytes=300)
+    assert cache.total_bytes == 300
+    assert not os.path.exists(tmp_path / "half.tmp")
+
+    # 수정 시각 순서가 사용 순서가 되므로 새 항목이 들어오면 old부터 지워진다
+    _render(cache, "newest", 100)
+    assert sorted(os.listdir(tmp_path)) == ["middle", "new", "newest"]
+
+    # 캐시 크기를 줄여 다시 시작하면 오래된 것부터 정리된다
+    cache = PreviewCache(str(tmp_path), max_bytes=150)
+    assert sorted(os.listdir(tmp_path)) == ["newest"]
@@ -0,0 +1,89 @@
+# backend/tests/test_storage.py
+
+import asyncio
+import os
+
+import pytest
+
+boto3 = pytest.importorskip("boto3")
+moto = pytest.importorskip("moto")
+
+from storage import S3_PART_SIZE, S3Storage
+
+BUCKET = "lecture-test"
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    # moto가 가짜 S3로 가로채므로 실제 자격 증명·네트워크는 쓰지 않는다
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    with moto.mock_aws():
+        boto3.client("s3", region_name="us-east-1").create_bucket(Bucket=BUCKET)
+        yield S3Storage(BUCKET, prefix="uploads", region="us-east-1", chunk_size=64 * 1024)
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+async def _chunks(data: bytes, size: int):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+
+async def _read(storage, key, start=0, end=None) -> bytes:
+    return b"".join([chunk async for chunk in storage.get_range(key, start, end)])
+
+
+def test_put_stream_small_and_multipart(s3):
+    small = os.urandom(1000)
+    # 파트 크기보다 커서 멀티파트 업로드(파트 2개)로 나뉜다
+    large = os.urandom(S3_PART_SIZE + 12345)
+
+    async def scenario():
+        assert await s3.put_stream("u/s/week_1/small.txt", _chunks(small, 300)) == len(small)
+        assert await s3.put_stream("u/s/week_1/large.pdf", _chunks(large, 1024 * 1024)) == len(large)
+        info = await s3.stat("u/s/week_1/large.pdf")
+        assert info.size == len(large)
+        assert await _read(s3, "u/s/week_1/small.txt") == small
+        assert await _read(s3, "u/s/week_1/large.pdf") == large
+        assert await s3.stat("u/s/week_1/missing.pdf") is None
+
+    _run(scenario())
+    # prefix 아래에 저장된다
+    keys = [item["Key"] for item in boto3.client("s3").list_objects_v2(Bucket=BUCKET)["Contents"]]
+    assert sorted(keys) == ["uploads/u/s/week_1/large.pdf", "uploads/u/s/week_1/small.txt"]
+
+
+def test_get_range(s3):
+    data = bytes(range(256)) * 1024
+
+    async def scenario():
+        await s3.put_bytes("u/s/week_1/a.pdf", data)
+        assert await _read(s3, "u/s/week_1/a.pdf", 0, 99) == data[:100]
+        assert await _read(s3, "u/s/week_1/a.pdf", 1000, 200000) == data[1000:200001]
+        assert await _read(s3, "u/s/week_1/a.pdf", len(data) - 10) == data[-10:]
+        assert await _read(s3, "u/s/week_1/a.pdf") == data
+
+    _run(scenario())
+
+
+def test_list_prefix_and_delete(s3):
+    async def scenario():
+        for key in ("u/s/week_1/a.pdf", "u/s/week_2/b.pdf", "u/s/week_2/.notes.tmp", "other/s/week_1/c.pdf"):
+            await s3.put_bytes(key, b"x")
+        listed = [info.key for info in await s3.list_prefix("u/")]
+        # 사용자가 올린 점(.) 파일도 목록에 나온다
+        assert listed == ["u/s/week_1/a.pdf", "u/s/week_2/.notes.tmp", "u/s/week_2/b.pdf"]
+
+        await s3.delete("u/s/week_1/a.pdf")
+        # 없는 키를 지워도 오류가 아니다
+        await s3.delete("u/s/week_1/a.pdf")
+        assert [info.key for info in await s3.list_prefix("u/")] == ["u/s/week_2/.notes.tmp", "u/s/week_2/b.pdf"]
+        with pytest.raises(FileNotFoundError):
+            await _read(s3, "u/s/week_1/a.pdf")
+        await s3.close()
+
+    _run(scenario())
@@ -0,0 +1,55 @@
+# backend/tests/test_zipstream.py
+
+import asyncio
+import io
+import time
+import zipfile
+
+from storage import LocalStorage
+from zipstream import aiter_zip
+
+
+async def _build_zip(storage: LocalStorage, keys: list) -> bytes:
+    entries = [(key, time.time(), 0, storage.get_range(key)) for key in keys]
+    return b"".join([chunk async for chunk in aiter_zip(entries)])
+
+
+def test_missing_entry_is_skipped(tmp_path):
+    storage = LocalStorage(str(tmp_path))
+
+    async def scenario():
+        await storage.put_bytes("u/s/week_1/a.txt", "가나다".encode("utf-8") * 1000)
+        await storage.put_bytes("u/s/week_1/b.pdf", b"%PDF-1.4")
+        await storage.put_bytes("u/s/week_1/empty.txt", b"")
+        keys = [info.key for info in await storage.list_prefix("u/")]
+        # 목록을 만든 뒤 ZIP을 만들기 전에 지워진 파일
+        await storage.delete("u/s/week_1/b.pdf")
+        data = await _build_zip(storage, keys)
+        await storage.close()
+        return data
+
+    with zipfile.ZipFile(io.BytesIO(asyncio.run(scenario()))) as zf:
+        assert zf.testzip() is None
+        assert zf.namelist() == ["u/s/week_1/a.txt", "u/s/week_1/empty.txt"]
+        assert zf.read("u/s/week_1/a.txt") == "가나다".encode("utf-8") * 1000
+
+
+def test_only_own_temp_files_are_hidden(tmp_path):
+    storage = LocalStorage(str(tmp_path))
+    week = tmp_path / "u" / ".hidden subject" / "week_1"
+    week.mkdir(parents=True)
+    for name in (".lecture.pdf.0123456789abcdef0123456789abcdef.tmp", "." + "f" * 32 + ".part",
+                 ".notes.txt", "draft.tmp", "lecture.pdf"):
+        (week / name).write_bytes(b"x")
+
+    async def scenario():
+        listed = [info.key for info in await storage.list_prefix("u/")]
+        await storage.close()
+        return listed
+
+    listed = asyncio.run(scenario())
+    assert listed == [
+        "u/.hidden subject/week_1/.notes.txt",
+        "u/.hidden subject/week_1/draft.tmp",
+        "u/.hidden subject/week_1/lecture.pdf",
+    ]
@@ -0,0 +1,153 @@
+# backend/zipstream.py
+
+import asyncio
+import os
+import threading
+import time
+import uuid
+import zipfile
+from typing import AsyncIterator, Iterable, Optional, Tuple
+
+# 이미 압축된 형식은 다시 압축해 봐야 CPU만 쓰고 크기는 거의 줄지 않으므로 그대로 저장(ZIP_STORED)
+STORED_EXTENSIONS = {
+    ".pdf", ".png", ".jpg", ".jpeg", ".gif", ".webp",
+    ".zip", ".7z", ".rar", ".gz", ".bz2", ".xz",
+    ".mp3", ".mp4", ".m4a", ".mov", ".avi", ".mkv",
+    ".pptx", ".docx", ".xlsx", ".hwpx",
+}
+
+# ZIP은 1980년 이전 시각을 기록할 수 없다
+_ZIP_EPOCH = 315532800
+
+
+class _ChunkBuffer:
+    """
+    ZipFile이 써 넣는 바이트를 잠시 모아 두었다가 꺼내 가는 쓰기 전용 버퍼.
+    tell/seek를 지원하지 않으므로 ZipFile은 data descriptor 방식으로 스트리밍 ZIP을 만든다.
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data) -> int:
+        if data:
+            self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def compress_type_for(filename: str) -> int:
+    if os.path.splitext(filename)[1].lower() in STORED_EXTENSIONS:
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
+
+async def aiter_zip(entries: Iterable[Tuple[str, float, int, AsyncIterator[bytes]]]) -> AsyncIterator[bytes]:
+    """
+    (ZIP 안의 경로, 수정 시각, 크기, 내용 청크) 목록을 순서대로 ZIP에 넣으면서 ZIP 바이트를 조금씩 내보냅니다.
+    내용은 저장소에서 비동기로 읽어 오고, 압축(deflate)은 스레드에서 해 이벤트 루프를 막지 않습니다.
+    한 번에 메모리에 올라가는 양은 청크 하나 정도로 일정합니다.
+    """
+    buf = _ChunkBuffer()
+    zf = zipfile.ZipFile(buf, mode="w")
+    for arcname, mtime, size, chunks in entries:
+        # 목록을 만든 뒤 지워진 파일은 헤더를 쓰기 전에 첫 청크를 읽어 보고 건너뛴다 (ZIP이 중간에 끊기지 않게)
+        try:
+            first = await chunks.__anext__()
+        except StopAsyncIteration:
+            first = b""
+        except FileNotFoundError:
+            continue
+        zinfo = zipfile.ZipInfo(arcname, date_time=time.localtime(max(mtime, _ZIP_EPOCH))[:6])
+        zinfo.external_attr = 0o644 << 16
+        zinfo.compress_type = compress_type_for(arcname)
+        with zf.open(zinfo, mode="w", force_zip64=size >= zipfile.ZIP64_LIMIT) as dst:
+            if first:
+                await _write(dst, zinfo, first)
+            async for data in chunks:
+                await _write(dst, zinfo, data)
+                out = buf.drain()
+                if out:
+                    yield out
+        out = buf.drain()
+        if out:
+            yield out
+    # 마지막으로 central directory를 기록해 내보낸다
+    zf.close()
+    out = buf.drain()
+    if out:
+        yield out
+
+
+async def _write(dst, zinfo: zipfile.ZipInfo, data: bytes) -> None:
+    if zinfo.compress_type == zipfile.ZIP_STORED:
+        dst.write(data)
+    else:
+        await asyncio.to_thread(dst.write, data)
+
+
+class ZipCache:
+    """
+    upload_id별로 미리 만들어 둔 ZIP을 디스크에 보관합니다.
+    /upload, /assignments, 요약 작업 완료로 해당 upload_id의 내용이 바뀌면 invalidate()로 지워지고,
+    그 전까지는 같은 ZIP 파일을 그대로 내려주므로 반복 다운로드에 압축 비용이 들지 않습니다.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self._lock = threading.Lock()
+        # 무효화될 때마다 증가하는 세대 번호. 만드는 도중 바뀐 ZIP은 캐시에 넣지 않는다
+        self._generations = {}
+
+    def path_for(self, upload_id: str) -> str:
+        return os.path.join(self.root, f"{upload_id}.zip")
+
+    def get(self, upload_id: str) -> Optional[str]:
+        path = self.path_for(upload_id)
+        return path if os.path.isfile(path) else None
+
+    def invalidate(self, upload_id: str) -> None:
+        with self._lock:
+            self._generations[upload_id] = self._generations.get(upload_id, 0) + 1
+            try:
+                os.remove(self.path_for(upload_id))
+            except FileNotFoundError:
+                pass
+
+    async def tee(self, upload_id: str, chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        """
+        chunks를 그대로 내보내면서 임시 파일에도 기록하고,
+        끝까지 문제없이 만들어졌으면 캐시 파일로 교체합니다.
+        중간에 클라이언트가 끊기면 임시 파일은 지웁니다.
+        """
+        with self._lock:
+            generation = self._generations.get(upload_id, 0)
+        tmp_path = os.path.join(self.root, f".{upload_id}.{uuid.uuid4().hex}.tmp")
+        completed = False
+        out_f = await asyncio.to_thread(open, tmp_path, "wb")
+        try:
+            async for chunk in chunks:
+                await asyncio.to_thread(out_f.write, chunk)
+                yield chunk
+            completed = True
+        finally:
+            await asyncio.to_thread(out_f.close)
+            await asyncio.to_thread(self._finish, upload_id, generation, tmp_path, completed)
+
+    def _finish(self, upload_id: str, generation: int, tmp_path: str, completed: bool) -> None:
+        with self._lock:
+            if completed and self._generations.get(upload_id, 0) == generation:
+                os.replace(tmp_path, self.path_for(upload_id))
+            else:
+                try:
+                    os.remove(tmp_path)
+                except FileNotFoundError:
+                    pass